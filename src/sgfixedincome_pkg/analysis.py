@@ -1,9 +1,81 @@
-import matplotlib.pyplot as plt
-import seaborn as sns
+import re
 import numpy as np
 import pandas as pd
 from sgfixedincome_pkg import equations
 
+# matplotlib and seaborn are imported inside the plot_* functions, so callers that only
+# use the data functions (e.g. best_rates, filter_df) don't pay their import cost
+
+def _contains_mask(values, pattern):
+    """
+    Case-insensitive substring match over a column of strings, evaluating each unique
+    string only once. Works for both object and categorical columns.
+
+    Parameters:
+        values (pd.Series): Column of strings to search (e.g. 'Product').
+        pattern (str): Regular expression to look for (e.g. a plain substring, or 'T-bill|SSB').
+
+    Returns:
+        np.ndarray: Boolean mask, True where the value contains the pattern. Missing values are False.
+    """
+    codes, uniques = pd.factorize(values) # Missing values get code -1
+    matches = pd.Series(uniques).str.contains(pattern, case=False, na=False).to_numpy(dtype=bool)
+    return np.append(matches, False)[codes] # Code -1 picks up the trailing False
+
+def _isin_mask(values, items):
+    """
+    Membership test over a column, evaluating each unique value only once. Works for
+    both object and categorical columns.
+
+    Parameters:
+        values (pd.Series): Column to test (e.g. 'Product provider').
+        items (list): Values to look for.
+
+    Returns:
+        np.ndarray: Boolean mask, True where the value is in items. Missing values are False.
+    """
+    codes, uniques = pd.factorize(values) # Missing values get code -1
+    matches = pd.Index(uniques).isin(items)
+    return np.append(matches, False)[codes] # Code -1 picks up the trailing False
+
+def _pair_labels(first, second, sep):
+    """
+    Joins two columns into a string label for each row, e.g. 'Product provider - Product'.
+
+    The observed (first, second) pairs are factorized first, so each label is joined once per
+    distinct pair that actually occurs and then looked up by code for every row.
+
+    Parameters:
+        first (pd.Series): Values for the first part of each label.
+        second (pd.Series): Values for the second part of each label, aligned with first.
+        sep (str): Separator placed between the two parts.
+
+    Returns:
+        pd.Series: The label for each row, aligned with first's index. Rows with a missing 
+        value in either column get NaN.
+    """
+    if first.empty: # MultiIndex.factorize cannot build uniques from no pairs
+        return pd.Series(index=first.index, dtype=object)
+
+    codes, uniques = pd.MultiIndex.from_arrays([first, second]).factorize()
+    labels = np.array(
+        [np.nan if pd.isna(a) or pd.isna(b) else f"{a}{sep}{b}" for a, b in uniques],
+        dtype=object
+        )
+    return pd.Series(labels.take(codes), index=first.index)
+
+def _provider_product_labels(df):
+    """
+    Builds the 'Product provider - Product' label for each row of df.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame containing the columns 'Product provider' and 'Product'.
+
+    Returns:
+        pd.Series: The label for each row, aligned with df's index.
+    """
+    return _pair_labels(df['Product provider'], df['Product'], ' - ')
+
 def filter_df(combined_df, investment_amount=None, min_tenure=0, max_tenure=999, 
               min_rate=None, consider_tbills=True, consider_ssbs=True, consider_fd=True, 
               include_providers=None, exclude_providers=None):
@@ -27,42 +99,51 @@ def filter_df(combined_df, investment_amount=None, min_tenure=0, max_tenure=999,
     Returns:
         pd.DataFrame: The filtered DataFrame based on the provided criteria.
     """
-    filtered_df = combined_df.copy()
+    # Build a single boolean mask against the original frame and index it once,
+    # rather than creating an intermediate DataFrame for every criterion
+    mask = np.ones(len(combined_df), dtype=bool)
 
     # Filter based on investment amount (if provided)
     if investment_amount is not None:
-        filtered_df = filtered_df[(filtered_df['Deposit lower bound'] <= investment_amount) & 
-                                   (filtered_df['Deposit upper bound'] >= investment_amount)]
+        mask &= combined_df['Deposit lower bound'].to_numpy() <= investment_amount
+        mask &= combined_df['Deposit upper bound'].to_numpy() >= investment_amount
 
     # Filter based on tenure range
-    filtered_df = filtered_df[(filtered_df['Tenure'] >= min_tenure) & 
-                               (filtered_df['Tenure'] <= max_tenure)]
+    tenures = combined_df['Tenure'].to_numpy()
+    mask &= tenures >= min_tenure
+    mask &= tenures <= max_tenure
     
     # Filter based on rate range (if provided)
     if min_rate is not None:
-        filtered_df = filtered_df[filtered_df['Rate'] >= min_rate]
+        mask &= combined_df['Rate'].to_numpy() >= min_rate
 
-    # Filter based on product (SSB, T-bill, Fixed Deposit)
-    if not consider_tbills:
-        filtered_df = filtered_df[~filtered_df['Product'].str.contains("T-bill", case=False, na=False)]
-    if not consider_ssbs:
-        filtered_df = filtered_df[~filtered_df['Product'].str.contains("SSB", case=False, na=False)]
-    if not consider_fd:
-        filtered_df = filtered_df[~filtered_df['Product'].str.contains("Fixed Deposit", case=False, na=False)]
+    # Filter based on product (SSB, T-bill, Fixed Deposit), matching all excluded types in one pass
+    excluded_products = [
+        product for product, consider in 
+        [("T-bill", consider_tbills), ("SSB", consider_ssbs), ("Fixed Deposit", consider_fd)]
+        if not consider
+        ]
+    if excluded_products:
+        pattern = '|'.join(re.escape(product) for product in excluded_products)
+        mask &= ~_contains_mask(combined_df['Product'], pattern)
 
     # Filter based on product provider (if provided)
     if include_providers:
-        filtered_df = filtered_df[filtered_df['Product provider'].isin(include_providers)]
+        mask &= _isin_mask(combined_df['Product provider'], include_providers)
     
     # Filter based on product provider (if provided)
     if exclude_providers:
-        filtered_df = filtered_df[~filtered_df['Product provider'].isin(exclude_providers)]
+        mask &= ~_isin_mask(combined_df['Product provider'], exclude_providers)
 
     # If no rows remain after filtering, raise an exception
-    if filtered_df.empty:
+    if not mask.any():
         raise ValueError("No products found matching the provided criteria.")
     
-    return filtered_df.reset_index(drop=True)
+    # take() already returns a new frame, so give it a fresh index directly
+    # rather than copying the data again with reset_index()
+    filtered_df = combined_df.take(np.flatnonzero(mask))
+    filtered_df.index = pd.RangeIndex(len(filtered_df))
+    return filtered_df
 
 def best_returns(combined_df, investment_amount, min_tenure=0, max_tenure=999):
     """
@@ -95,44 +176,75 @@ def best_returns(combined_df, investment_amount, min_tenure=0, max_tenure=999):
         investment_amount=investment_amount, 
         min_tenure=min_tenure, 
         max_tenure=max_tenure
-        ).copy()
+        )
     
     # If no valid rows remain after filtering, raise an exception
     if valid_inv_df.empty:
         raise ValueError(f"Cannot find valid products for an investment amount of {investment_amount}.")
     
-    # Calculate the maximum investable amount based on required multiples
-    def calculate_invested_amount(row):
-        if pd.isna(row['Required multiples']):
-            return investment_amount  # No multiples restriction, use the entire amount
-        max_multiple = investment_amount // row['Required multiples']
-        return max_multiple * row['Required multiples']  # Maximum valid investable amount
-    
-    valid_inv_df['Invested amount'] = valid_inv_df.apply(
-        calculate_invested_amount, axis=1
+    return _best_per_tenure(_add_invested_and_return(valid_inv_df, investment_amount), 'Total Dollar Return')
+
+def _add_invested_and_return(valid_inv_df, investment_amount):
+    """
+    Adds the 'Invested amount' and 'Total Dollar Return' columns for products that accept investment_amount.
+
+    Products which only accept investment in specific multiples are allocated the maximum amount
+    of investment they can take, and the remaining cash is assumed to earn no return.
+
+    Parameters:
+        valid_inv_df (pd.DataFrame): Output of filter_df for the investment amount.
+        investment_amount (float): The investment amount.
+
+    Returns:
+        pd.DataFrame: A copy of valid_inv_df with the two additional columns.
+    """
+    # Calculate the maximum investable amount based on required multiples. Products without
+    # a multiples restriction (NaN) can take the entire amount.
+    multiples = valid_inv_df['Required multiples'].to_numpy(dtype=float)  # None becomes NaN
+    no_multiples = np.isnan(multiples)
+    safe_multiples = np.where(no_multiples, 1.0, multiples)
+    invested_amounts = np.where(
+        no_multiples,
+        investment_amount,
+        (investment_amount // safe_multiples) * safe_multiples  # Maximum valid investable amount
         )
 
-    # Calculate the total dollar return for each row using the 'Invested amount'
-    valid_inv_df.loc[:, 'Total Dollar Return'] = valid_inv_df.apply(
-        lambda row: equations.calculate_dollar_return(
-            row['Invested amount'],
-            row['Rate'],
-            row['Tenure']
-        ),
-        axis=1
-    )
+    # Calculate the total dollar return for each row using the invested amount
+    dollar_returns = equations.calculate_dollar_return(
+        invested_amounts,
+        valid_inv_df['Rate'].to_numpy(),
+        valid_inv_df['Tenure'].to_numpy()
+        )
 
-    # Group by tenure and get the row with the maximum total return for each tenure
-    best_returns_df = valid_inv_df.loc[
-        valid_inv_df.groupby('Tenure')['Total Dollar Return'].idxmax()
-        ]
-    best_returns_df.sort_values(by='Tenure', inplace=True) # Sort by tenure
+    return valid_inv_df.assign(**{
+        'Invested amount': invested_amounts,
+        'Total Dollar Return': dollar_returns
+        })
 
-    return best_returns_df.reset_index(drop=True)
+def _best_per_tenure(df, column):
+    """
+    Keeps the row with the highest value of column for each tenure, ordered by tenure.
 
-def best_rates(combined_df, investment_amount, min_tenure=0, max_tenure=999):
+    The sort is stable, so ties keep the first row as groupby().idxmax() would.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame containing 'Tenure' and column.
+        column (str): The column to maximise within each tenure.
+
+    Returns:
+        pd.DataFrame: One row per tenure, with a fresh index.
     """
-    Display the highest rates offered for each possible tenure given an investment amount.
+    best_df = (
+        df
+        .sort_values(by=['Tenure', column], ascending=[True, False], kind='mergesort')
+        .drop_duplicates(subset='Tenure', keep='first')
+        )
+
+    return best_df.reset_index(drop=True)
+
+def best_summary(combined_df, investment_amount, min_tenure=0, max_tenure=999):
+    """
+    Computes the best_rates and best_returns tables together, filtering the products only once.
 
     Parameters:
         combined_df (pd.DataFrame): DataFrame containing columns 'Tenure', 'Rate', 'Deposit lower bound', 
@@ -142,28 +254,121 @@ def best_rates(combined_df, investment_amount, min_tenure=0, max_tenure=999):
         max_tenure (int, optional): The maximum tenure (in months) to consider. Default is 999.
 
     Returns:
-        pd.DataFrame: A DataFrame with the products offering the best rate (in % p.a.) for each tenure.
+        tuple: (best_rates_df, best_returns_df), identical to the outputs of best_rates and best_returns.
+
+    Raises:
+        ValueError: If no product matches the investment amount and tenure range.
     """
-    # Filter rows where the investment_amount and Tenure is within the allowed bounds
     valid_inv_df = filter_df(
         combined_df,
         investment_amount=investment_amount, 
         min_tenure=min_tenure, 
         max_tenure=max_tenure
-        ).copy()
+        )
+
+    best_rates_df = _best_per_tenure(valid_inv_df, 'Rate')
+    best_returns_df = _best_per_tenure(_add_invested_and_return(valid_inv_df, investment_amount), 'Total Dollar Return')
+
+    return best_rates_df, best_returns_df
+
+def best_rates(combined_df, investment_amount, min_tenure=0, max_tenure=999):
+    """
+    Display the highest rates offered for each possible tenure given an investment amount.
+
+    Parameters:
+        combined_df (pd.DataFrame): DataFrame containing columns 'Tenure', 'Rate', 'Deposit lower bound', 
+                                    'Deposit upper bound', 'Required multiples', 'Product provider', 'Product'.
+        investment_amount (float): The investment amount to filter available rates and products for that amount.
+        min_tenure (int, optional): The minimum tenure (in months) to consider. Default is 0.
+        max_tenure (int, optional): The maximum tenure (in months) to consider. Default is 999.
+
+    Returns:
+        pd.DataFrame: A DataFrame with the products offering the best rate (in % p.a.) for each tenure.
+    """
+    candidates = _rate_sorted_candidates(combined_df, investment_amount, min_tenure, max_tenure)
+    return _best_rates_from_candidates(candidates, investment_amount)
+
+def _rate_sorted_candidates(df, investment_amount, min_tenure=0, max_tenure=999):
+    """
+    Products whose minimum deposit is met by investment_amount and whose tenure is within range,
+    sorted by tenure and then by rate (highest first).
+
+    This is the shared starting point of best_rates and the better allocation strategy. The sort 
+    is stable, so products with equal rates keep their original order.
+
+    Parameters:
+        df (pd.DataFrame): DataFrame containing 'Tenure', 'Rate', 'Deposit lower bound', 
+                            'Deposit upper bound', 'Product provider', 'Product'.
+        investment_amount (float): The investment amount.
+        min_tenure (int, optional): The minimum tenure (in months) to include. Default is 0.
+        max_tenure (int, optional): The maximum tenure (in months) to include. Default is 999.
+
+    Returns:
+        pd.DataFrame: The sorted candidate products.
+    """
+    tenures = df['Tenure'].to_numpy()
+    mask = df['Deposit lower bound'].to_numpy() <= investment_amount
+    mask &= tenures >= min_tenure
+    mask &= tenures <= max_tenure
+    return df[mask].sort_values(by=['Tenure', 'Rate'], ascending=[True, False], kind='mergesort')
+
+def _best_rates_from_candidates(candidates, investment_amount):
+    """
+    Picks the highest rate product for each tenure from the output of _rate_sorted_candidates.
+
+    Parameters:
+        candidates (pd.DataFrame): Candidate products sorted by tenure and then by rate (highest first).
+        investment_amount (float): The investment amount, used to apply the deposit upper bound.
+
+    Returns:
+        pd.DataFrame: A DataFrame with the products offering the best rate (in % p.a.) for each tenure.
+
+    Raises:
+        ValueError: If no product accepts the investment amount.
+    """
+    valid_inv_df = candidates[candidates['Deposit upper bound'].to_numpy() >= investment_amount]
     
     # If no valid rows remain after filtering, raise an exception
     if valid_inv_df.empty:
-        raise ValueError(f"Cannot find valid products for an investment amount of {investment_amount}.")
+        raise ValueError("No products found matching the provided criteria.")
 
-    # Group by tenure and get the row with the highest rate for each tenure
-    best_rates_df = valid_inv_df.loc[
-        valid_inv_df.groupby('Tenure')['Rate'].idxmax()
-        ]
-    best_rates_df.sort_values(by='Tenure', inplace=True) # Sort by tenure
+    # Keep the top row for each tenure. The sort is stable, so ties keep the first row 
+    # as groupby().idxmax() would.
+    best_rates_df = valid_inv_df.drop_duplicates(subset='Tenure', keep='first')
 
     return best_rates_df.reset_index(drop=True)
 
+def best_rates_arrays(combined_df, investment_amount, min_tenure=0, max_tenure=999):
+    """
+    Returns the best rate for each tenure as plain NumPy arrays, for callers such as plots 
+    that only need the tenure, rate and product label rather than the full DataFrame.
+
+    Parameters:
+        combined_df (pd.DataFrame): DataFrame containing columns 'Tenure', 'Rate', 'Deposit lower bound', 
+                                    'Deposit upper bound', 'Required multiples', 'Product provider', 'Product'.
+        investment_amount (float): The investment amount to filter available rates and products for that amount.
+        min_tenure (int, optional): The minimum tenure (in months) to consider. Default is 0.
+        max_tenure (int, optional): The maximum tenure (in months) to consider. Default is 999.
+
+    Returns:
+        tuple: A tuple containing:
+
+            - np.ndarray: The tenures (in months), in ascending order.
+            - np.ndarray: The best rate (in % p.a.) for each tenure.
+            - np.ndarray: The 'Product provider - Product' label of the product offering each best rate.
+    """
+    return _rates_arrays(best_rates(combined_df, investment_amount, min_tenure, max_tenure))
+
+def _rates_arrays(best_rates_df):
+    """
+    Splits a best rates DataFrame into (tenures, rates, labels) NumPy arrays. See best_rates_arrays.
+    """
+    return (
+        best_rates_df['Tenure'].to_numpy(dtype=float),
+        best_rates_df['Rate'].to_numpy(dtype=float),
+        _provider_product_labels(best_rates_df).to_numpy()
+        )
+
 def products(combined_df):
     """
     Returns a list of unique products in the dataset by joining the 'Product provider' and 'Product' columns.
@@ -175,15 +380,16 @@ def products(combined_df):
     Returns:
         list: A list of unique product combinations in the format 'Product provider - Product'.
     """
-    # Combine 'Product provider' and 'Product' into a single string for each row
-    product_combinations = combined_df['Product provider'] + ' - ' + combined_df['Product']
+    # Combine 'Product provider' and 'Product' into a single string for each row. The labels
+    # are built once per unique pair, using the same helper as the plotting functions.
+    product_combinations = _provider_product_labels(combined_df)
     
     # Get the unique combinations and return them as a list
     unique_products = product_combinations.unique().tolist()
 
     return unique_products
 
-def plot_rates_vs_tenure(df, investment_amount, min_tenure=0, max_tenure=999):
+def plot_rates_vs_tenure(df, investment_amount, min_tenure=0, max_tenure=999, show=True, ax=None):
     """
     Plots a graph of Rate (% p.a.) vs Tenure (in months) for a given investment amount
     with optional filtering by tenure range. Each unique 'Product provider - Product' 
@@ -196,17 +402,25 @@ def plot_rates_vs_tenure(df, investment_amount, min_tenure=0, max_tenure=999):
         investment_amount (float): The investment amount to filter rows for the plot.
         min_tenure (int, optional): Minimum tenure (in months) to include. Default is 0.
         max_tenure (int or float, optional): Maximum tenure (in months) to include. Default is 999.
+        show (bool, optional): Whether to display the plot with plt.show(). Default is True.
+        ax (matplotlib.axes.Axes, optional): Axes to draw on. Default is None (a new figure is created).
+
+    Returns:
+        matplotlib.figure.Figure: The figure containing the plot.
 
     Raises:
         ValueError: If no valid rows remain after filtering based on the investment amount and tenure.
     """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     # Filter rows by investment amount and tenure range
     filtered_df = filter_df(
         df,
         investment_amount=investment_amount, 
         min_tenure=min_tenure, 
         max_tenure=max_tenure
-        ).copy()
+        )
 
     # Raise an exception if no valid rows remain
     if filtered_df.empty:
@@ -214,36 +428,50 @@ def plot_rates_vs_tenure(df, investment_amount, min_tenure=0, max_tenure=999):
                          f"and tenure range {min_tenure}-{max_tenure} months.")
 
     # Create a unique identifier for each product provider-product pair
-    filtered_df['Product Combination'] = (
-        filtered_df['Product provider'] + ' - ' + filtered_df['Product']
-    )
+    filtered_df = filtered_df.assign(**{
+        'Product Combination': _provider_product_labels(filtered_df)
+        })
+
+    # Sort once by line and tenure so seaborn can draw each line without re-sorting it.
+    # The legend keeps the order in which products first appear in the data.
+    hue_order = filtered_df['Product Combination'].unique()
+    filtered_df = filtered_df.sort_values(by=['Product Combination', 'Tenure'], kind='mergesort')
 
     # Plotting
-    plt.figure(figsize=(12, 8))
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(12, 8))
+    else:
+        fig = ax.figure
     sns.lineplot(
+        ax=ax,
         data=filtered_df,
         x='Tenure',
         y='Rate',
         hue='Product Combination',
+        hue_order=hue_order,
+        sort=False,
         marker='o'
     )
 
     # Customizing the plot
-    plt.title(
+    ax.set_title(
         f'Rate (% p.a.) vs Tenure for Investment Amount: {investment_amount}\n'
         f'Filtered by Tenure: {min_tenure} to {max_tenure} months',
         fontsize=16
     )
-    plt.xlabel('Tenure (Months)', fontsize=14)
-    plt.ylabel('Rate (% p.a.)', fontsize=14)
-    plt.legend(title='Product Provider - Product', fontsize=12, title_fontsize=14, loc='best')
-    plt.grid(True, linestyle='--', alpha=0.6)
-    plt.tight_layout()
+    ax.set_xlabel('Tenure (Months)', fontsize=14)
+    ax.set_ylabel('Rate (% p.a.)', fontsize=14)
+    ax.legend(title='Product Provider - Product', fontsize=12, title_fontsize=14, loc='best')
+    ax.grid(True, linestyle='--', alpha=0.6)
+    fig.tight_layout()
 
     # Show the plot
-    plt.show()
+    if show:
+        plt.show()
+
+    return fig
 
-def plot_best_rates(df, investment_amount, min_tenure=0, max_tenure=999):
+def plot_best_rates(df, investment_amount, min_tenure=0, max_tenure=999, show=True, ax=None):
     """
     Plot of best rates (% p.a.) for each tenure for a given investment amount, across
     available products. The plot color-codes the points by provider-product pair.
@@ -255,23 +483,32 @@ def plot_best_rates(df, investment_amount, min_tenure=0, max_tenure=999):
                                     to calculate the total return.
         min_tenure (int, optional): The minimum tenure (in months) to consider. Default is 0.
         max_tenure (int, optional): The maximum tenure (in months) to consider. Default is 999.
+        show (bool, optional): Whether to display the plot with plt.show(). Default is True.
+        ax (matplotlib.axes.Axes, optional): Axes to draw on. Default is None (a new figure is created).
+
+    Returns:
+        matplotlib.figure.Figure: The figure containing the plot.
     """
-    # Get best rates DataFrame
-    best_rates_df = best_rates(df, investment_amount, min_tenure, max_tenure)
-    
-    # Combine 'Product provider' and 'Product' for unique identification
-    best_rates_df['Provider-Product'] = best_rates_df['Product provider'] + " - " + best_rates_df['Product']
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Get best rates, with 'Product provider' and 'Product' combined for unique identification
+    tenures, rates, labels = best_rates_arrays(df, investment_amount, min_tenure, max_tenure)
     
     # Create the plot
-    plt.figure(figsize=(12, 8))
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(12, 8))
+    else:
+        fig = ax.figure
     
     # Draw a single continuous line
-    plt.plot(best_rates_df['Tenure'], best_rates_df['Rate'], 
-             linestyle='-', color='black', alpha=0.7)
+    ax.plot(tenures, rates, 
+            linestyle='-', color='black', alpha=0.7)
     
     # Add points, color-coded by Provider-Product
     sns.scatterplot(
-        data=best_rates_df,
+        ax=ax,
+        data={'Tenure': tenures, 'Rate': rates, 'Provider-Product': labels},
         x='Tenure',
         y='Rate',
         hue='Provider-Product',
@@ -281,17 +518,20 @@ def plot_best_rates(df, investment_amount, min_tenure=0, max_tenure=999):
     )
     
     # Add labels and grid
-    plt.title("Rate (% p.a.) by Tenure (Color-coded by Provider-Product)", fontsize=16)
-    plt.xlabel("Tenure (months)", fontsize=14)
-    plt.ylabel("Rate (% p.a.)", fontsize=14)
-    plt.grid(alpha=0.3)
-    plt.legend(title="Provider-Product", fontsize=14, bbox_to_anchor=(1.05, 1), loc='upper left')
-    plt.tight_layout()
+    ax.set_title("Rate (% p.a.) by Tenure (Color-coded by Provider-Product)", fontsize=16)
+    ax.set_xlabel("Tenure (months)", fontsize=14)
+    ax.set_ylabel("Rate (% p.a.)", fontsize=14)
+    ax.grid(alpha=0.3)
+    ax.legend(title="Provider-Product", fontsize=14, bbox_to_anchor=(1.05, 1), loc='upper left')
+    fig.tight_layout()
 
     # Show the plot
-    plt.show()
+    if show:
+        plt.show()
 
-def plot_bank_offerings_with_fuzz(df, product_provider, fuzz_factor=0.02):
+    return fig
+
+def plot_bank_offerings_with_fuzz(df, product_provider, fuzz_factor=0.02, show=True, ax=None):
     """
     Plots a graph of Rate (% p.a.) vs Tenure (in months) for a given bank, where each line represents a 
     different deposit range (created by joining 'Deposit lower bound' and 'Deposit upper bound').
@@ -302,29 +542,45 @@ def plot_bank_offerings_with_fuzz(df, product_provider, fuzz_factor=0.02):
                             'Deposit upper bound', 'Product provider'.
         product_provider (str): The bank name (Product provider) to filter the data for.
         fuzz_factor (float, optional): The amount of fuzz (random noise) to add to the points. Default is 0.02.
+        show (bool, optional): Whether to display the plot with plt.show(). Default is True.
+        ax (matplotlib.axes.Axes, optional): Axes to draw on. Default is None (a new figure is created).
+
+    Returns:
+        matplotlib.figure.Figure: The figure containing the plot.
 
     Raises:
         ValueError: If no data is available for the given product_provider.
     """
-    # Filter rows for the specified product provider and create a copy
-    filtered_df = df[df['Product provider'] == product_provider].copy()
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Filter rows for the specified product provider
+    filtered_df = df[df['Product provider'] == product_provider]
 
     # Raise an exception if no valid rows remain after filtering
     if filtered_df.empty:
         raise ValueError(f"No data available for the product provider {product_provider}.")
 
+    # Draw the tenure and rate fuzz together in a single call
+    rng = np.random.default_rng()
+    fuzz = rng.uniform(-fuzz_factor, fuzz_factor, size=(len(filtered_df), 2))
+
     # Create a unique identifier for each deposit range and add small random fuzz
     filtered_df = filtered_df.assign(
-        Deposit_Range=filtered_df['Deposit lower bound'].astype(str) + '-' + filtered_df['Deposit upper bound'].astype(str),
-        Tenure_fuzzed=filtered_df['Tenure'] + np.random.uniform(-fuzz_factor, fuzz_factor, len(filtered_df)),
-        Rate_fuzzed=filtered_df['Rate'] + np.random.uniform(-fuzz_factor, fuzz_factor, len(filtered_df))
+        Deposit_Range=_pair_labels(filtered_df['Deposit lower bound'], filtered_df['Deposit upper bound'], '-'),
+        Tenure_fuzzed=filtered_df['Tenure'].to_numpy() + fuzz[:, 0],
+        Rate_fuzzed=filtered_df['Rate'].to_numpy() + fuzz[:, 1]
     )
 
     # Plotting
-    plt.figure(figsize=(12, 8))
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(12, 8))
+    else:
+        fig = ax.figure
 
     # Plot a separate line for each deposit range
     sns.lineplot(
+        ax=ax,
         data=filtered_df,
         x='Tenure_fuzzed',
         y='Rate_fuzzed',
@@ -336,15 +592,18 @@ def plot_bank_offerings_with_fuzz(df, product_provider, fuzz_factor=0.02):
     )
 
     # Customizing the plot
-    plt.title(f'Rate (% p.a.) vs Tenure for {product_provider}', fontsize=16)
-    plt.xlabel('Tenure (Months)', fontsize=14)
-    plt.ylabel('Rate (% p.a.)', fontsize=14)
-    plt.legend(title='Deposit Range', fontsize=12, title_fontsize=14, loc='best')
-    plt.grid(True, linestyle='--', alpha=0.6)
-    plt.tight_layout()
+    ax.set_title(f'Rate (% p.a.) vs Tenure for {product_provider}', fontsize=16)
+    ax.set_xlabel('Tenure (Months)', fontsize=14)
+    ax.set_ylabel('Rate (% p.a.)', fontsize=14)
+    ax.legend(title='Deposit Range', fontsize=12, title_fontsize=14, loc='best')
+    ax.grid(True, linestyle='--', alpha=0.6)
+    fig.tight_layout()
 
     # Show the plot
-    plt.show()
+    if show:
+        plt.show()
+
+    return fig
 
 def better_allocation(df, investment_amount, tenure):
     """
@@ -391,8 +650,8 @@ def better_allocation(df, investment_amount, tenure):
     
     # Filter rows by the investment amount and the given tenure
     filtered_df = df[
-        (df['Deposit lower bound'] <= investment_amount) & 
-        (df['Tenure'] == tenure)
+        (df['Deposit lower bound'].to_numpy() <= investment_amount) & 
+        (df['Tenure'].to_numpy() == tenure)
     ]
 
     # Raise an exception if no valid rows remain after filtering
@@ -400,92 +659,152 @@ def better_allocation(df, investment_amount, tenure):
         raise ValueError(f"No data available for the investment amount of {investment_amount} and tenure of {tenure} months.")
     
     # Sort products by rate in descending order (highest rate first)
-    filtered_df = filtered_df.sort_values(by='Rate', ascending=False)
+    filtered_df = filtered_df.sort_values(by='Rate', ascending=False, kind='mergesort')
+
+    allocation_df = _allocate_sorted(filtered_df, investment_amount, tenure)
+    if allocation_df is None:
+        raise ValueError("Could not find any valid allocations with the given constraints.")
+
+    return allocation_df
+
+def _allocate_sorted(sorted_df, investment_amount, tenure):
+    """
+    Runs the greedy allocation of better_allocation on products that have already been
+    filtered to a single tenure and sorted by rate in descending order.
+
+    Parameters:
+        sorted_df (pd.DataFrame): Products for one tenure, sorted by 'Rate' (highest first).
+        investment_amount (float): The total investment amount to allocate across different products.
+        tenure (int): The tenure in months for the investment.
+
+    Returns:
+        pd.DataFrame or None: The allocation table described in better_allocation, including the 
+        summary row, or None if no valid allocation can be made.
+    """
+    # Pull the columns used by the greedy allocation out as NumPy arrays once,
+    # so the loop below works on plain values rather than per-row Series objects
+    providers = sorted_df['Product provider'].to_numpy()
+    product_names = sorted_df['Product'].to_numpy()
+    rates = sorted_df['Rate'].to_numpy(dtype=float)
+    lower_bounds = sorted_df['Deposit lower bound'].to_numpy(dtype=float)
+    upper_bounds = sorted_df['Deposit upper bound'].to_numpy(dtype=float)
+    multiples = sorted_df['Required multiples'].to_numpy(dtype=float)  # None becomes NaN
 
     remaining_amount = investment_amount
-    allocations = []
-    total_return = 0
+    is_selected = np.zeros(len(rates), dtype=bool)  # Products we allocate to
+    allocated_amounts = np.zeros(len(rates))
     used_provider_products = set()  # Track which provider-product pairs we've used
 
     # Allocate the investment to the products
-    for _, product in filtered_df.iterrows():
+    for i in range(len(rates)):
         # Check how much we can allocate to this product
         if remaining_amount <= 0:
             break
 
         # Create unique identifier for provider-product pair
-        provider_product = (product['Product provider'], product['Product'])
+        provider_product = (providers[i], product_names[i])
         
         # Skip if we've already allocated to this provider-product pair
         if provider_product in used_provider_products:
             continue
 
-        max_allocatable = min(
-            product['Deposit upper bound'],
-            remaining_amount
-        )
+        max_allocatable = min(upper_bounds[i], remaining_amount)
         
         # If we can't meet the minimum deposit, skip this product
-        if max_allocatable < product['Deposit lower bound']:
+        if max_allocatable < lower_bounds[i]:
             continue
 
         # Calculate the allocation
         allocation = max_allocatable
 
         # Handle required multiples if they exist
-        if pd.notna(product['Required multiples']) and product['Required multiples'] > 0:
+        if multiples[i] > 0:  # False for NaN
             # Calculate maximum number of multiples we can allocate
-            num_multiples = int(allocation // product['Required multiples'])
-            allocation = num_multiples * product['Required multiples']
+            allocation = (allocation // multiples[i]) * multiples[i]
             
             # If we can't meet even one multiple, skip this product
-            if allocation < product['Required multiples']:
+            if allocation < multiples[i]:
                 continue
-        
-        # Calculate return for this allocation
-        product_return = equations.calculate_dollar_return(allocation, product['Rate'], tenure)
-        
-        # Track the allocation
-        allocations.append({
-            'Product provider': product['Product provider'],
-            'Product': product['Product'],
-            'Allocated amount': allocation,
-            'Rate (% p.a.)': product['Rate'],
-            'Expected return ($)': product_return
-        })
 
-        # Mark this provider-product pair as used
+        # Track the allocation and mark this provider-product pair as used
+        is_selected[i] = True
+        allocated_amounts[i] = allocation
         used_provider_products.add(provider_product)
         
-        # Deduct the allocated amount and update total return
+        # Deduct the allocated amount
         remaining_amount -= allocation
-        total_return += product_return
 
-    # If we have allocations, calculate summary statistics
-    if allocations:
-        # Calculate per annum rate
-        total_percentage_return = (total_return / investment_amount) * 100
-        per_annum_rate = equations.calculate_per_annum_rate(total_percentage_return, tenure)
-        
-        # Convert allocations to a DataFrame
-        allocation_df = pd.DataFrame(allocations)
-
-        # Add total summary row
-        summary_row = pd.DataFrame([{
-            'Product provider': 'Total',
-            'Product': 'All Products',
-            'Allocated amount': investment_amount - remaining_amount,
-            'Rate (% p.a.)': per_annum_rate,
-            'Expected return ($)': total_return
-        }])
-
-        allocation_df = pd.concat([allocation_df, summary_row], ignore_index=True)
-        
-        return allocation_df
-    else:
-        raise ValueError("Could not find any valid allocations with the given constraints.")
+    if not is_selected.any():
+        return None
+
+    # Calculate the returns for all allocations in a single vectorized call
+    selected = np.flatnonzero(is_selected)
+    allocated_amounts = allocated_amounts[selected]
+    selected_rates = rates[selected]
+    product_returns = equations.calculate_dollar_return(allocated_amounts, selected_rates, tenure)
+    total_return = product_returns.sum()
+
+    # Calculate per annum rate
+    total_percentage_return = (total_return / investment_amount) * 100
+    per_annum_rate = equations.calculate_per_annum_rate(total_percentage_return, tenure)
+
+    # Build the allocation table in one go, with the total summary row appended to each column
+    allocation_df = pd.DataFrame({
+        'Product provider': np.append(providers[selected], 'Total'),
+        'Product': np.append(product_names[selected], 'All Products'),
+        'Allocated amount': np.append(allocated_amounts, investment_amount - remaining_amount),
+        'Rate (% p.a.)': np.append(selected_rates, per_annum_rate),
+        'Expected return ($)': np.append(product_returns, total_return)
+    })
+
+    return allocation_df
+
+def _tenures_in_range(df, min_tenure, max_tenure):
+    """
+    Sorted unique tenures in df that lie within [min_tenure, max_tenure].
+
+    Parameters:
+        df (pd.DataFrame): DataFrame containing a 'Tenure' column.
+        min_tenure (int): The minimum tenure (in months) to include.
+        max_tenure (int): The maximum tenure (in months) to include.
+
+    Returns:
+        np.ndarray: The sorted tenures within the range.
+    """
+    tenures = np.sort(df['Tenure'].unique())
+    return tenures[(tenures >= min_tenure) & (tenures <= max_tenure)]
+
+def _better_allocation_rates(candidates, investment_amount, tenures):
+    """
+    Effective rates (% p.a.) of the better allocation strategy for each of the given tenures.
+
+    Equivalent to calling better_allocation once per tenure, but works from candidates that
+    were filtered and sorted a single time, running the allocation on each tenure's group.
+
+    Parameters:
+        candidates (pd.DataFrame): Output of _rate_sorted_candidates for the investment amount.
+        investment_amount (float): The total investment amount to allocate across different products.
+        tenures (list): The tenures (in months) to compute rates for.
+
+    Returns:
+        list: The effective rate for each tenure, or None where no valid allocation exists.
+    """
+    groups = dict(tuple(candidates.groupby('Tenure', sort=False)))
+
+    rates = []
+    for tenure in tenures:
+        group = groups.get(tenure)
+        allocation_df = None if group is None else _allocate_sorted(group, investment_amount, tenure)
+        if allocation_df is None:
+            # Append None if no valid data or allocation for the tenure
+            rates.append(None)
+        else:
+            # Extract the total Rate (% p.a.) from the summary row
+            rates.append(allocation_df['Rate (% p.a.)'].iloc[-1])
 
-def plot_better_allocation_strategy(df, investment_amount, min_tenure=0, max_tenure=999):
+    return rates
+
+def plot_better_allocation_strategy(df, investment_amount, min_tenure=0, max_tenure=999, show=True, ax=None):
     """
     Plot the Rate (% p.a.) against Tenure (Months) for the better allocation strategy 
     across all tenures available in the dataframe.
@@ -496,36 +815,43 @@ def plot_better_allocation_strategy(df, investment_amount, min_tenure=0, max_ten
         investment_amount (float): The total investment amount to allocate across different products.
         min_tenure (int, optional): The minimum tenure (in months) to include. Default is 0.
         max_tenure (int, optional): The maximum tenure (in months) to include. Default is 999.
+        show (bool, optional): Whether to display the plot with plt.show(). Default is True.
+        ax (matplotlib.axes.Axes, optional): Axes to draw on. Default is None (a new figure is created).
+
+    Returns:
+        matplotlib.figure.Figure: The figure containing the plot.
     """
-    # Extract all unique tenures from the dataframe and sort them
-    tenures = sorted(df['Tenure'].unique())
-    tenures = [t for t in tenures if min_tenure <= t <= max_tenure]
-    rates = []
+    import matplotlib.pyplot as plt
 
-    for tenure in tenures:
-        try:
-            # Get a better allocation for the given tenure
-            allocation_df = better_allocation(df, investment_amount, tenure)
-            # Extract the total Rate (% p.a.) from the summary row
-            total_rate = allocation_df.loc[allocation_df['Product provider'] == 'Total', 'Rate (% p.a.)'].values[0]
-            rates.append(total_rate)
-        except ValueError:
-            # Append NaN if no valid data for the tenure
-            rates.append(None)
+    # Extract all unique tenures in range from the dataframe, sorted
+    tenures = _tenures_in_range(df, min_tenure, max_tenure)
+
+    # Get the better allocation rate for each tenure
+    candidates = _rate_sorted_candidates(df, investment_amount, min_tenure, max_tenure)
+    rates = _better_allocation_rates(candidates, investment_amount, tenures)
 
     # Plot the results
-    plt.figure(figsize=(10, 6))
-    plt.plot(tenures, rates, marker='o', linestyle='-', color='blue', label='Effective Rate (% p.a.)')
-    plt.title('Better Allocation Strategy: Rate (% p.a.) vs. Tenure (Months)', fontsize=16)
-    plt.xlabel('Tenure (Months)', fontsize=12)
-    plt.ylabel('Rate (% p.a.)', fontsize=12)
-    plt.grid(True, linestyle='--', alpha=0.6)
-    plt.xticks(tenures, rotation=45)
-    plt.legend(fontsize=12)
-    plt.tight_layout()
-    plt.show()
-
-def plot_pure_and_better_allocation_strategy_rates(df, investment_amount, min_tenure=0, max_tenure=999):
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(10, 6))
+    else:
+        fig = ax.figure
+    ax.plot(tenures, rates, marker='o', linestyle='-', color='blue', label='Effective Rate (% p.a.)')
+    ax.set_title('Better Allocation Strategy: Rate (% p.a.) vs. Tenure (Months)', fontsize=16)
+    ax.set_xlabel('Tenure (Months)', fontsize=12)
+    ax.set_ylabel('Rate (% p.a.)', fontsize=12)
+    ax.grid(True, linestyle='--', alpha=0.6)
+    ax.set_xticks(tenures)
+    ax.tick_params(axis='x', rotation=45)
+    ax.legend(fontsize=12)
+    fig.tight_layout()
+
+    # Show the plot
+    if show:
+        plt.show()
+
+    return fig
+
+def plot_pure_and_better_allocation_strategy_rates(df, investment_amount, min_tenure=0, max_tenure=999, show=True, ax=None):
     """
     Overlay plot for best rates (% p.a.) and effective better allocation strategy rates for each tenure.
 
@@ -535,33 +861,39 @@ def plot_pure_and_better_allocation_strategy_rates(df, investment_amount, min_te
         investment_amount (float): The investment amount to filter available rates and products.
         min_tenure (int, optional): The minimum tenure (in months) to include. Default is 0.
         max_tenure (int, optional): The maximum tenure (in months) to include. Default is 999.
+        show (bool, optional): Whether to display the plot with plt.show(). Default is True.
+        ax (matplotlib.axes.Axes, optional): Axes to draw on. Default is None (a new figure is created).
+
+    Returns:
+        matplotlib.figure.Figure: The figure containing the plot.
     """
-    # Get best rates DataFrame
-    best_rates_df = best_rates(df, investment_amount, min_tenure, max_tenure)
-    
-    # Combine 'Product provider' and 'Product' for unique identification
-    best_rates_df['Provider-Product'] = best_rates_df['Product provider'] + " - " + best_rates_df['Product']
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
+    # Filter and sort the candidate products once, shared by both strategies
+    candidates = _rate_sorted_candidates(df, investment_amount, min_tenure, max_tenure)
+
+    # Get best rates, with 'Product provider' and 'Product' combined for unique identification
+    best_tenures, best_rate_values, labels = _rates_arrays(
+        _best_rates_from_candidates(candidates, investment_amount)
+        )
     
     # Extract tenures for the better allocation strategy and filter by min/max tenure
-    tenures = sorted(df['Tenure'].unique())
-    tenures = [t for t in tenures if min_tenure <= t <= max_tenure]
+    tenures = _tenures_in_range(df, min_tenure, max_tenure)
     
     # Calculate rates for better allocation strategy
-    better_allocation_rates = []
-    for tenure in tenures:
-        try:
-            allocation_df = better_allocation(df, investment_amount, tenure)
-            total_rate = allocation_df.loc[allocation_df['Product provider'] == 'Total', 'Rate (% p.a.)'].values[0]
-            better_allocation_rates.append(total_rate)
-        except ValueError:
-            better_allocation_rates.append(None)
+    better_allocation_rates = _better_allocation_rates(candidates, investment_amount, tenures)
     
     # Create the combined plot
-    plt.figure(figsize=(12, 8))
+    if ax is None:
+        fig, ax = plt.subplots(figsize=(12, 8))
+    else:
+        fig = ax.figure
     
     # Plot the best individual rates
     sns.scatterplot(
-        data=best_rates_df,
+        ax=ax,
+        data={'Tenure': best_tenures, 'Rate': best_rate_values, 'Provider-Product': labels},
         x='Tenure',
         y='Rate',
         hue='Provider-Product',
@@ -569,20 +901,23 @@ def plot_pure_and_better_allocation_strategy_rates(df, investment_amount, min_te
         s=100,
         edgecolor='black'
     )
-    plt.plot(best_rates_df['Tenure'], best_rates_df['Rate'], 
-             linestyle='-', color='black', linewidth=2, alpha=0.4, label='Best Individual Rates (Line)')
+    ax.plot(best_tenures, best_rate_values, 
+            linestyle='-', color='black', linewidth=2, alpha=0.4, label='Best Individual Rates (Line)')
     
     # Plot the better allocation strategy rates as a continuous line
-    plt.plot(tenures, better_allocation_rates, 
-             linestyle='-', color='blue', marker='o', alpha=0.4, label='Better Allocation Strategy Rates', linewidth=2)
+    ax.plot(tenures, better_allocation_rates, 
+            linestyle='-', color='blue', marker='o', alpha=0.4, label='Better Allocation Strategy Rates', linewidth=2)
     
     # Add labels, legend, and grid
-    plt.title("Comparison of Best Individual Rates and Better Allocation Strategy Rates", fontsize=16)
-    plt.xlabel("Tenure (Months)", fontsize=14)
-    plt.ylabel("Rate (% p.a.)", fontsize=14)
-    plt.grid(alpha=0.3)
-    plt.legend(fontsize=12, bbox_to_anchor=(1.05, 1), loc='upper left')
-    plt.tight_layout()
+    ax.set_title("Comparison of Best Individual Rates and Better Allocation Strategy Rates", fontsize=16)
+    ax.set_xlabel("Tenure (Months)", fontsize=14)
+    ax.set_ylabel("Rate (% p.a.)", fontsize=14)
+    ax.grid(alpha=0.3)
+    ax.legend(fontsize=12, bbox_to_anchor=(1.05, 1), loc='upper left')
+    fig.tight_layout()
     
     # Show the plot
-    plt.show()
\ No newline at end of file
+    if show:
+        plt.show()
+
+    return fig
\ No newline at end of file
@@ -222,25 +222,117 @@ def create_tbill_df(tbill_details):
     }
     return pd.DataFrame(data)
 
+def fetch_ssb_data(client, current_ssb_holdings=0.0, check_warnings=True):
+    """
+    Create the SSB dataframe from the MAS API, recording failures and warnings instead of raising.
+
+    Parameters:
+        client: An initialized instance of the MAS_bondsandbills_APIClient.
+        current_ssb_holdings (float, optional): The amount of SSBs you currently hold in Singapore dollars. Defaults to 0.0.
+        check_warnings (bool, optional): Whether to check the SSB application deadline. Default is True.
+
+    Returns:
+        tuple: (SSB dataframe, list of fetch failure dicts, list of warning messages). The dataframe
+        is empty if fetching failed.
+    """
+    fetch_failures = []
+    warnings_list = []
+    try:
+        SSB_df = create_ssb_df(client, current_ssb_holdings)
+
+        # Run past_last_day_to_apply_ssb_warning
+        if check_warnings:
+            warnings_list.extend(_ssb_warnings(client))
+    except Exception as e:
+        SSB_df = pd.DataFrame()  # Empty dataframe for SSB
+        fetch_failures.append({'product': 'MAS SSB', 'error': str(e)})
+
+    return SSB_df, fetch_failures, warnings_list
+
+def fetch_tbill_data(client, tbill_threshold=10, check_warnings=True):
+    """
+    Create the T-bill dataframe from the MAS API, recording failures and warnings instead of raising.
+
+    Parameters:
+        client: An initialized instance of the MAS_bondsandbills_APIClient.
+        tbill_threshold (int, optional): The threshold for the yield difference in basis points for
+                                         the T-bill warning. Default is 10.
+        check_warnings (bool, optional): Whether to check for a sudden T-bill yield change. Default is True.
+
+    Returns:
+        tuple: (T-bill dataframe, list of fetch failure dicts, list of warning messages). The dataframe
+        is empty if fetching failed.
+    """
+    fetch_failures = []
+    warnings_list = []
+    try:
+        tbill_details = client.get_most_recent_6m_tbill()
+        tbill_df = create_tbill_df(tbill_details)
+
+        # Run sudden_6m_tbill_yield_change_warning
+        if check_warnings:
+            warnings_list.extend(_tbill_warnings(client, tbill_threshold))
+    except Exception as e:
+        tbill_df = pd.DataFrame()  # Empty dataframe for T-bills
+        fetch_failures.append({'product': 'MAS T-bill', 'error': str(e)})
+
+    return tbill_df, fetch_failures, warnings_list
+
+def _ssb_warnings(client):
+    """Return the SSB application deadline warning, if any, as a list of messages."""
+    try:
+        client.past_last_day_to_apply_ssb_warning()
+    except Warning as warning:
+        return [str(warning)]
+    return []
+
+def _tbill_warnings(client, tbill_threshold):
+    """Return the sudden 6-month T-bill yield change warning, if any, as a list of messages."""
+    try:
+        client.sudden_6m_tbill_yield_change_warning(threshold=tbill_threshold)
+    except Warning as warning:
+        return [str(warning)]
+    return []
+
+def fetch_mas_warnings(client, tbill_threshold=10):
+    """
+    Run the date-dependent MAS checks on their own, without building any dataframes.
+
+    These depend on the current date and the latest bid yield, so callers that cache the
+    SSB and T-bill data for a long time can run them more often than they refetch the data.
+
+    Parameters:
+        client: An initialized instance of the MAS_bondsandbills_APIClient.
+        tbill_threshold (int, optional): The threshold for the yield difference in basis points for
+                                         the T-bill warning. Default is 10.
+
+    Returns:
+        list: Warning messages from the SSB deadline and T-bill yield change checks.
+    """
+    return _ssb_warnings(client) + _tbill_warnings(client, tbill_threshold)
+
+# Bank fixed deposit pages scraped by default
+DEFAULT_SCRAPE_INPUTS = [
+    (
+        "https://www.dbs.com.sg/personal/rates-online/fixed-deposit-rate-singapore-dollar.page",
+        "tbl-primary mBot-24",
+        "DBS"
+    ),
+    (
+        "https://www.uob.com.sg/personal/online-rates/singapore-dollar-time-fixed-deposit-rates.page",
+        "table__carousel-table",
+        "UOB"
+    ),
+    (
+        "https://www.ocbc.com/personal-banking/deposits/fixed-deposit-sgd-interest-rates.page",
+        "table__comparison-table",
+        "OCBC"
+    )
+]
+
 # Final key function that produces main dataframe output with all data
 def create_combined_df(
-    scrape_inputs=[
-        (
-            "https://www.dbs.com.sg/personal/rates-online/fixed-deposit-rate-singapore-dollar.page",
-            "tbl-primary mBot-24",
-            "DBS"
-        ),
-        (
-            "https://www.uob.com.sg/personal/online-rates/singapore-dollar-time-fixed-deposit-rates.page",
-            "table__carousel-table",
-            "UOB"
-        ),
-        (
-            "https://www.ocbc.com/personal-banking/deposits/fixed-deposit-sgd-interest-rates.page",
-            "table__comparison-table",
-            "OCBC"
-        )
-    ],
+    scrape_inputs=DEFAULT_SCRAPE_INPUTS,
     current_ssb_holdings=0.0,
     tbill_threshold=10
 ):
@@ -275,43 +367,19 @@ def create_combined_df(
             
             - list of str: List of warning messages generated during the process.
     """
-    fetch_failures = [] # Initialize a list to store fetch failures
-    warnings_list = []  # Initialize a list to store warnings
-    client = MAS_bondsandbills_APIClient() # Initialize the MAS API client
-
     # Create dataframe with combined bank data by scraping
-    banks_df, bank_fetch_failures = create_banks_df(scrape_inputs)
-    fetch_failures.extend(bank_fetch_failures)  # Add bank failures to the list
+    banks_df, fetch_failures = create_banks_df(scrape_inputs)
     
-    # Create dataframe with SSB data from MAS API
-    try:
-        SSB_df = create_ssb_df(client, current_ssb_holdings)
-
-        # Run past_last_day_to_apply_ssb_warning
-        try:
-            client.past_last_day_to_apply_ssb_warning()
-        except Warning as warning:
-            warnings_list.append(str(warning))
-    except Exception as e:
-        SSB_df = pd.DataFrame()  # Empty dataframe for SSB
-        fetch_failures.append({'product': 'MAS SSB', 'error': str(e)})
-
-    # Create dataframe with T-bill data from MAS API
-    try:
-        tbill_details = client.get_most_recent_6m_tbill()
-        tbill_df = create_tbill_df(tbill_details)
-
-        # Run sudden_6m_tbill_yield_change_warning
-        try:
-            client.sudden_6m_tbill_yield_change_warning(threshold=tbill_threshold)
-        except Warning as warning:
-            warnings_list.append(str(warning))
-    except Exception as e:
-        tbill_df = pd.DataFrame()  # Empty dataframe for T-bills
-        fetch_failures.append({'product': 'MAS T-bill', 'error': str(e)})
+    # Create dataframes with SSB and T-bill data from MAS API. The client's pooled connections
+    # are shared by all MAS requests and released on exit, even if a fetch raises
+    with MAS_bondsandbills_APIClient() as client:
+        SSB_df, ssb_failures, warnings_list = fetch_ssb_data(client, current_ssb_holdings)
+        tbill_df, tbill_failures, tbill_warnings = fetch_tbill_data(client, tbill_threshold)
+    fetch_failures.extend(ssb_failures + tbill_failures)
+    warnings_list.extend(tbill_warnings)
 
     # Merge the three dataframes
     df_list = [banks_df, SSB_df, tbill_df]
     combined_df = merge_dataframes(df_list)
 
-    return combined_df, fetch_failures, warnings_list
\ No newline at end of file
+    return combined_df, fetch_failures, warnings_list
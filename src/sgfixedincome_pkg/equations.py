@@ -1,43 +1,62 @@
+import numpy as np
+
 def calculate_dollar_return(investment, rate, tenure):
     """
     Calculate the dollar return from an investment based on its rate of return 
     and the tenure (in months).
 
+    Inputs may also be NumPy arrays or pandas Series of equal length, in which case
+    the returns for all elements are computed in a single vectorized call.
+
     Parameters:
-        investment (float): The initial amount invested in dollars.
-        rate (float): The annual rate of return in percentage (%).
-        tenure (int): The investment tenure in months.
+        investment (float or array-like): The initial amount invested in dollars.
+        rate (float or array-like): The annual rate of return in percentage (%).
+        tenure (int or array-like): The investment tenure in months.
 
     Returns:
-        float: The dollar return from the investment after the given tenure.
+        float or array-like: The dollar return from the investment after the given tenure.
 
     Raises:
         ValueError: If investment or rate is negative, or tenure is non-positive (zero or negative).
     """
-    if investment < 0 or rate < 0 or tenure <= 0:
+    if np.any(np.less(investment, 0)) or np.any(np.less(rate, 0)) or np.any(np.less_equal(tenure, 0)):
         raise ValueError("Investment and rate must be more than or equal zero. Tenure must be more than zero.")
 
-    total_percentage_return = (1 + rate / 100) ** (tenure / 12) - 1
+    # expm1/log1p evaluate (1 + r) ** t - 1 without losing precision for small rates
+    total_percentage_return = np.expm1(np.log1p(np.divide(rate, 100)) * np.divide(tenure, 12))
     dollar_return = investment * total_percentage_return
-    return round(dollar_return, 2)
+    if np.ndim(dollar_return):  # Array-like inputs
+        return np.round(dollar_return, 2)
+    return round(float(dollar_return), 2)
 
 def calculate_per_annum_rate(total_percentage_return, tenure):
     """
     Calculate the equivalent annual rate of return (in percentage) based on 
     a given total percentage return over a specific tenure (in months).
 
+    Inputs may also be NumPy arrays or pandas Series of equal length, in which case
+    the rates for all elements are computed in a single vectorized call.
+
     Parameters:
-        total_percentage_return (float): The total percentage return over the entire investment period.
-        tenure (int): The tenure of the investment in months.
+        total_percentage_return (float or array-like): The total percentage return over the entire investment period.
+        tenure (int or array-like): The tenure of the investment in months.
 
     Returns:
-        float: The annualized rate of return (in percentage).
+        float or array-like: The annualized rate of return (in percentage).
 
     Raises:
         ValueError: If tenure is not positive.
     """
-    if tenure <= 0:
+    if np.any(np.less_equal(tenure, 0)):
         raise ValueError("Tenure must be a positive value.")
-    
+
+    # Convert lists and other sequences to arrays so the arithmetic below is element-wise
+    if not np.isscalar(total_percentage_return):
+        total_percentage_return = np.asarray(total_percentage_return)
+    if not np.isscalar(tenure):
+        tenure = np.asarray(tenure)
+
     per_annum_rate = ((total_percentage_return / 100 + 1) ** (12 / tenure) - 1) * 100
+    if np.ndim(per_annum_rate):  # Array-like inputs
+        return np.round(per_annum_rate, 2)
     return round(per_annum_rate, 2)
\ No newline at end of file
@@ -1,26 +1,167 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import numpy as np
 import pandas as pd
 import warnings
+import functools
+import hashlib
+import json
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from urllib.parse import urlencode
 import pytz
 from sgfixedincome_pkg import equations
 
+# How long (in seconds) a cached response stays fresh for each endpoint, following how often
+# MAS updates it. Endpoints not listed here are never cached.
+CACHE_TTLS = {
+    "listsavingbonds": 24 * 3600,       # New SSB issue monthly
+    "savingbondsinterest": 24 * 3600,
+    "listbondsandbills": 6 * 3600,      # T-bill auctions roughly every two weeks
+    "pricesandyields_chart": 3600,      # Daily bid yields
+}
+
+@dataclass
+class ResponseCache:
+    """
+    On-disk cache of MAS API responses, stored as one JSON file per endpoint and parameters.
+
+    Attributes:
+        directory (str): Directory holding the cached responses. Created on first write.
+    """
+    directory: str
+
+    def _path(self, endpoint, params):
+        query = urlencode(sorted((params or {}).items()))
+        key = hashlib.md5(f"{endpoint}?{query}".encode(), usedforsecurity=False).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def load(self, endpoint, params):
+        """
+        Return the cached entry {"ts", "body", "etag", "last_modified"}, or None if it is missing or unreadable.
+        """
+        try:
+            with open(self._path(endpoint, params)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def set(self, endpoint, params, body, etag=None, last_modified=None):
+        """
+        Store a response body with its ETag and Last-Modified validators, replacing any earlier
+        entry atomically.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(endpoint, params)
+        entry = {"ts": time.time(), "body": body, "etag": etag, "last_modified": last_modified}
+
+        # Write to a uniquely named file in the same directory, so concurrent writers (e.g. the
+        # threads of _fetch_many) never share a temporary file, then move it into place
+        with tempfile.NamedTemporaryFile("w", dir=self.directory, suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            try:
+                json.dump(entry, f)
+            except BaseException:
+                f.close()
+                os.remove(tmp_path)
+                raise
+        os.replace(tmp_path, path)
+
+    def clear(self):
+        """
+        Delete all cached responses, along with any temporary files left by interrupted writes.
+        """
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith((".json", ".tmp")):
+                os.remove(os.path.join(self.directory, name))
+
+@functools.lru_cache(maxsize=8)
+def _ssb_tenure_rates(coupons):
+    """
+    Builds the SSB tenure rates table for MAS_bondsandbills_APIClient.calculate_ssb_tenure_rates.
+
+    Args:
+        coupons (tuple): Validated coupon rates for each year (year 1 to 10).
+
+    Returns:
+        pd.DataFrame: DataFrame containing tenure and corresponding annual rates.
+    """
+    # Compute all 120 monthly tenures (10yrs) at once
+    coupons = np.asarray(coupons, dtype=float)
+    tenures = np.arange(1, 121)  # Tenure in months (starting from 1)
+    n_years = tenures // 12  # Full years completed
+    month_of_yr = tenures % 12  # Months into the current year
+
+    # Calculate total percentage return on the invested amount: the sum of all full year
+    # coupons, plus the current year's coupon prorated if tenure is not a multiple of 12
+    full_year_returns = np.concatenate(([0.0], np.cumsum(coupons)))[n_years]
+    current_year_coupons = coupons[np.minimum(n_years, 9)]  # Unused for tenure 120 (month_of_yr == 0)
+    total_percentage_returns = full_year_returns + np.where(
+        month_of_yr == 0, 0.0, current_year_coupons * month_of_yr / 12
+        )
+
+    # Calculate the annualized rates
+    annual_rates = equations.calculate_per_annum_rate(total_percentage_returns, tenures)
+
+    return pd.DataFrame({"Tenure": tenures, "Rate": annual_rates})
+
 class MAS_bondsandbills_APIClient:
     """
     API client for interacting with Monetary Authority of Singapore (MAS) bonds and bills endpoints.
     """
 
-    def __init__(self):
+    # (connect, read) timeouts in seconds for each request
+    timeout = (3.05, 10)
+
+    def __init__(self, cache_dir=None):
         """
         Initialize the API client.
 
+        All requests go through one requests.Session, so consecutive calls to the MAS
+        host reuse the same pooled connection instead of repeating the TCP and TLS
+        handshakes. Transient failures (429 and 5xx responses) are retried with backoff.
+
+        Responses are cached on disk only if cache_dir is given or the SGFI_CACHE_DIR
+        environment variable is set; each endpoint's entries expire after CACHE_TTLS.
+
         Args:
-            base_url (str): Base URL for the MAS API.
+            cache_dir (str, optional): Directory for cached responses. Default is None,
+                                       which falls back to SGFI_CACHE_DIR (no caching if unset).
         """
         base_url = "https://eservices.mas.gov.sg/statistics/api/v1/bondsandbills/m/"
         self.base_url = base_url
 
-    def fetch_data(self, endpoint, params=None):
+        cache_dir = cache_dir or os.environ.get("SGFI_CACHE_DIR")
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+
+        # raise_on_status=False hands the last response back so that fetch_data still
+        # raises requests.HTTPError once the retries are used up
+        retries = Retry(
+            total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False
+            )
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retries))
+
+    def close(self):
+        """
+        Close the underlying session and its pooled connections.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def fetch_data(self, endpoint, params=None, force_refresh=False):
         """
         Fetch data from the MAS API.
 
@@ -28,6 +169,7 @@ class MAS_bondsandbills_APIClient:
             endpoint (str): The API endpoints (e.g., listbondsandbills, 
                             pricesandyields_chart, savingbondsinterest, listsavingbonds)
             params (dict, optional): Query parameters for the request.
+            force_refresh (bool, optional): Skip any cached response and fetch from the API. Default is False.
 
         Returns:
             dict: The JSON response from the API.
@@ -35,10 +177,62 @@ class MAS_bondsandbills_APIClient:
         Raises:
             requests.HTTPError: If the request fails.
         """        
+        ttl = CACHE_TTLS.get(endpoint)
+        use_cache = self.cache is not None and ttl is not None
+        entry = None
+        if use_cache and not force_refresh:
+            entry = self.cache.load(endpoint, params)
+            if entry is not None and time.time() - entry["ts"] < ttl:
+                return entry["body"]
+
+        # Revalidate a stale cached entry with a conditional request, so that an unchanged
+        # response comes back as a bodiless 304 instead of the full payload
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
         url = self.base_url + endpoint
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        return response.json()
+        response = self.session.get(url, params=params, headers=headers or None, timeout=self.timeout)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if headers and response.status_code == 304:
+            # Not modified: keep the cached body and its validators, and restart its TTL
+            data = entry["body"]
+            etag = etag or headers.get("If-None-Match")
+            last_modified = last_modified or headers.get("If-Modified-Since")
+        else:
+            response.raise_for_status()
+            data = response.json()
+
+        if use_cache:
+            try:
+                self.cache.set(endpoint, params, data, etag=etag, last_modified=last_modified)
+            except OSError:
+                pass  # An unwritable cache directory should not stop the fetch itself
+        return data
+
+    def _fetch_many(self, calls):
+        """
+        Run independent API calls concurrently over the shared session.
+
+        The calls are I/O-bound, so overlapping them brings the total wait down from
+        the sum of their round-trips to roughly the slowest one.
+
+        Args:
+            calls (list): Zero-argument callables, e.g. bound client methods.
+
+        Returns:
+            list: The result of each call, in the same order as calls.
+
+        Raises:
+            Exception: The first exception raised by any of the calls, in call order.
+        """
+        with ThreadPoolExecutor(max_workers=min(8, len(calls))) as executor:
+            futures = [executor.submit(call) for call in calls]
+            return [future.result() for future in futures]
 
     def get_latest_ssb_details(self):
         """
@@ -140,23 +334,9 @@ class MAS_bondsandbills_APIClient:
         if not all(coupons[i] <= coupons[i+1] for i in range(len(coupons)-1)):
             raise ValueError("Coupon rates must be monotonically increasing.")
 
-        records = []
-        for i in range(120): # Iterate through all 120 months (10yrs)
-            tenure = i + 1  # Tenure in months (starting from 1)
-            n_years = tenure // 12  # Full years completed
-            month_of_yr = tenure % 12  # Months into the current year
-
-            # Calculate total percentage return on the invested amount
-            if month_of_yr == 0:  # If tenure is a multiple of 12
-                total_percentage_return = sum(coupons[:n_years])  # Sum of all full year coupons
-            else: # If tenure is not a multiple of 12, prorate returns for current year
-                total_percentage_return = sum(coupons[:n_years]) + coupons[n_years] * month_of_yr / 12
-
-            # Calculate the annualized rate
-            annual_rate = equations.calculate_per_annum_rate(total_percentage_return, tenure)
-            records.append({"Tenure": tenure, "Rate": annual_rate})
-
-        return pd.DataFrame(records)
+        # The table only depends on the coupons, so it is built once per distinct coupon
+        # vector. Callers get a copy so that they cannot modify the cached DataFrame.
+        return _ssb_tenure_rates(tuple(coupons)).copy()
     
     def get_most_recent_6m_tbill(self):
         """
@@ -240,12 +420,11 @@ class MAS_bondsandbills_APIClient:
             None: This function only issues a warning if the yield difference exceeds the threshold
             or if we fail to sucessfully check if the yield difference exceeds the threshold.
         """
-        # Fetch the most recent 6-month T-bill bid yield
+        # Fetch the most recent 6-month T-bill bid yield and cutoff yield together
         try:
-            bid_yield = self.get_6m_tbill_bid_yield()
-
-            # Fetch the most recent 6-month T-bill cutoff yield
-            tbill_details = self.get_most_recent_6m_tbill()
+            bid_yield, tbill_details = self._fetch_many(
+                [self.get_6m_tbill_bid_yield, self.get_most_recent_6m_tbill]
+                )
             cutoff_yield = tbill_details["cutoff_yield"]
             
             # Issue a warning if yield difference exceeds threshold
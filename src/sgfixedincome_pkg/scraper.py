@@ -1,16 +1,25 @@
 # Import necessary libraries
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import pandas as pd
+import numpy as np
 import re
+import functools
+
+# Regular expressions used when parsing table contents, compiled once at import
+_BOUNDS_JUNK_RE = re.compile(r'[A-Za-z$\s,]') # Currency symbols, commas, spaces and letters in deposit ranges
+_COMPARATOR_RE = re.compile(r'[><]')
+_TENURE_RE = re.compile(r"(\d+)(?:\s*-\s*(\d+))?") # Single value, or range when the second group matches
 
 # Fetch webpage content
-def fetch_webpage(url):
+def fetch_webpage(url, parse_only=None):
     """
     Fetches webpage content from the given URL.
     
     Parameters:
         url (str): The URL of the website to scrape.
+        parse_only (SoupStrainer, optional): Restricts parsing to matching elements, skipping the
+            tree construction for the rest of the page. Default is None (the whole page is parsed).
 
     Returns:
         BeautifulSoup: Parsed HTML content of the page.
@@ -21,7 +30,7 @@ def fetch_webpage(url):
     try:
         response = requests.get(url) # Fetch the webpage
         response.raise_for_status() # Check for request errors
-        return BeautifulSoup(response.text, "html.parser") # Parse the webpage content
+        return BeautifulSoup(response.text, "html.parser", parse_only=parse_only) # Parse the webpage content
     except Exception as e:
         raise Exception(f"Failed to fetch or parse the webpage: {e}")
 
@@ -111,7 +120,7 @@ def parse_bounds(deposit_range):
         - "Above 30,000" -> (30000.01, 99999999.0)
     """
     # Clean the string: remove unwanted characters (e.g., "$", "S$", commas, spaces, letters)
-    cleaned_range = re.sub(r'[A-Za-z$\s,]', '', deposit_range)
+    cleaned_range = _BOUNDS_JUNK_RE.sub('', deposit_range)
 
     # Handle ranges (e.g., "10000-20000", ">20000-50000")
     if '-' in cleaned_range:
@@ -143,7 +152,7 @@ def parse_bounds(deposit_range):
     # Handle "Below X" or "<X" (only upper bound is defined)
     if 'below' in deposit_range.lower() or cleaned_range.startswith('<'):
         try:
-            upper = float(re.sub(r'[><]', '', cleaned_range)) - 0.01
+            upper = float(_COMPARATOR_RE.sub('', cleaned_range)) - 0.01
             return 0.0, upper
         except ValueError:
             raise ValueError(f"Invalid 'below' format: {deposit_range}")
@@ -151,7 +160,7 @@ def parse_bounds(deposit_range):
     # Handle "Above X" or ">X" (only lower bound is defined)
     if 'above' in deposit_range.lower() or cleaned_range.startswith('>'):
         try:
-            lower = float(re.sub(r'[><]', '', cleaned_range)) + 0.01
+            lower = float(_COMPARATOR_RE.sub('', cleaned_range)) + 0.01
             return lower, 99999999.0
         except ValueError:
             raise ValueError(f"Invalid 'above' format: {deposit_range}")
@@ -201,20 +210,18 @@ def parse_tenure(period_str, header_str):
     if not (header_valid or content_valid):
         raise ValueError(f"Neither header '{header_str}' nor content '{period_str}' indicates months.")
     
-    # Match range (e.g., "6 - 8", "6-12 months")
-    range_match = re.match(r"(\d+)\s*-\s*(\d+)", period_str)
-    if range_match:
-        start, end = map(int, range_match.groups())
-        return list(range(start, end + 1))
-    
-    # Match single value (e.g., "12-months", "12 mths")
-    single_match = re.match(r"(\d+)", period_str)
-    if single_match:
-        return [int(single_match.group(1))]
+    # Match range (e.g., "6 - 8", "6-12 months") or single value (e.g., "12-months", "12 mths")
+    tenure_match = _TENURE_RE.match(period_str)
+    if tenure_match:
+        start, end = tenure_match.groups()
+        if end is None: # Single value
+            return [int(start)]
+        return list(range(int(start), int(end) + 1))
     
     # If parsing fails, raise an error
     raise ValueError(f"Unable to parse tenure: '{period_str}'")
 
+@functools.lru_cache(maxsize=1024) # Pure function, and tables repeat the same rate strings (e.g. 'N.A')
 def clean_rate_value(rate_value):
     """
     Cleans the rate value by removing any non-numeric characters and converting to a float.
@@ -268,38 +275,40 @@ def reshape_table(raw_df):
             - Deposit upper bound: The upper bound of the deposit range (as float, or None if not specified).
     
     Raises:
-        ValueError: If the first column does not contain keywords indicating tenure information.
+        ValueError: If the first column does not contain keywords indicating tenure information, or if
+                    the table has no tenures or deposit range columns to reshape.
     """
     # Validate that the first column contains tenure-related data
     first_col = raw_df.columns[0]
     if not any(keyword in first_col.lower() for keyword in ['period', 'tenor', 'tenure']):
         raise ValueError("The first column does not contain 'Period', 'Tenor', or 'Tenure'.")
     
-    data = [] # Initialize an empty list to hold the reshaped data
-    for _, row in raw_df.iterrows(): # Iterate over each row, don't need row index so '_'
-        # Get a list of tenures from first column in each row (e.g., "6-month")
-        tenures = parse_tenure(row[first_col], first_col) 
-
-        # Iterate over each tenure in the list
-        for tenure in tenures:
-            for col in raw_df.columns[1:]: # Iterate over each column in the row
-                lower, upper = parse_bounds(col) # Assume all column headers except the first contain deposit ranges
-                rate_value = clean_rate_value(row[col])
-                data.append({
-                    'Tenure': float(tenure),
-                    'Rate': rate_value,
-                    'Deposit lower bound': lower,
-                    'Deposit upper bound': upper,
-                })
+    # Parse each tenure cell and deposit range header once, rather than for every (tenure, deposit range) pair
+    tenures = [parse_tenure(period, first_col) for period in raw_df[first_col]]
+    range_bounds = [parse_bounds(col) for col in raw_df.columns[1:]] # Assume all column headers except the first contain deposit ranges
+    tenure_values = [float(tenure) for period_tenures in tenures for tenure in period_tenures]
+    if not tenure_values or not range_bounds:
+        raise ValueError("The table does not contain any tenure and deposit range combinations.")
+    lower_bounds, upper_bounds = zip(*range_bounds)
+
+    # Build one row per (table row, tenure, deposit range), in table order: each table row's rates
+    # are repeated for every tenure it covers, and the deposit ranges cycle within each tenure
+    row_positions = np.repeat(np.arange(len(raw_df)), [len(period_tenures) for period_tenures in tenures])
+    rate_cells = raw_df.iloc[:, 1:].to_numpy()[row_positions].ravel()
+    df = pd.DataFrame({
+        'Tenure': np.repeat(tenure_values, len(range_bounds)),
+        'Rate': [clean_rate_value(rate_value) for rate_value in rate_cells],
+        'Deposit lower bound': np.tile(lower_bounds, len(tenure_values)),
+        'Deposit upper bound': np.tile(upper_bounds, len(tenure_values)),
+    })
     
-    # Convert to a DataFrame and remove rows where 'Rate' is None
-    df = pd.DataFrame(data)
+    # Remove rows where 'Rate' is None
     df = df.dropna(subset=['Rate'])
 
     return df
 
 # Main function to orchestrate the scraping
-def scrape_deposit_rates(url, table_class, provider, req_multiples=None):
+def scrape_deposit_rates(url, table_class, provider, req_multiples=None, fetcher=None):
     """
     Scrapes deposit rates from the given URL and manually add extra information.
 
@@ -314,6 +323,10 @@ def scrape_deposit_rates(url, table_class, provider, req_multiples=None):
         table_class (str): Class name of the table to locate in the website.
         provider (str): The name of the provider offering the fixed deposit products.
         req_multiples (optional, float or None): The required multiples for the deposit, if applicable. Defaults to None.
+        fetcher (callable, optional): Function taking the URL and a parse_only keyword and returning the parsed
+            page. Defaults to None, which uses fetch_webpage as looked up at call time, so patching
+            scraper.fetch_webpage still takes effect. Tests can also pass a function returning a prepared
+            BeautifulSoup object.
 
     Returns:
         pd.DataFrame: A pandas DataFrame containing the reshaped deposit rates data, with additional columns:
@@ -325,8 +338,11 @@ def scrape_deposit_rates(url, table_class, provider, req_multiples=None):
     Raises:
         Exception: If the scraping or data extraction process fails, an exception will be raised.
     """
+    fetcher = fetcher or fetch_webpage
     try:
-        soup = fetch_webpage(url)
+        # Only <table> elements are needed, so skip building the tree for the rest of the page.
+        # Classes are matched afterwards by extract_table, as the strainer would miss tables with multiple classes
+        soup = fetcher(url, parse_only=SoupStrainer("table"))
         tables = extract_table(soup, table_class)
 
         for table in tables: # Try to process each table
@@ -8,6 +8,75 @@ import base64
 import json
 from zoneinfo import ZoneInfo
 from sgfixedincome_pkg import consolidate, analysis
+from sgfixedincome_pkg.mas_api_client import MAS_bondsandbills_APIClient
+
+# Direct fetches are cached per source, with TTLs following how often each source changes.
+# Each loader returns (df, failures, fetch timestamp). The date-dependent MAS warnings are
+# checked separately on every direct fetch, so they are never older than get_data's cache.
+@st.cache_data(ttl=86400)  # Bank rack rates rarely change within a day
+def load_bank_data():
+    df, failures = consolidate.create_banks_df(consolidate.DEFAULT_SCRAPE_INPUTS)
+    return df, failures, datetime.now(ZoneInfo("Asia/Singapore"))
+
+@st.cache_data(ttl=86400)  # New SSB issue monthly
+def load_ssb_data():
+    with MAS_bondsandbills_APIClient() as client:
+        df, failures, _ = consolidate.fetch_ssb_data(client, check_warnings=False)
+    return df, failures, datetime.now(ZoneInfo("Asia/Singapore"))
+
+@st.cache_data(ttl=21600)  # T-bill auctions roughly every two weeks; bid yields move daily
+def load_tbill_data():
+    with MAS_bondsandbills_APIClient() as client:
+        df, failures, _ = consolidate.fetch_tbill_data(client, check_warnings=False)
+    return df, failures, datetime.now(ZoneInfo("Asia/Singapore"))
+
+def load_source(loader):
+    """Call a cached loader, dropping its cached result if any fetch failed so the next run retries."""
+    result = loader()
+    if result[1]:
+        loader.clear()
+    return result
+
+def load_mas_warnings():
+    with MAS_bondsandbills_APIClient() as client:
+        return consolidate.fetch_mas_warnings(client)
+
+def with_categorical_labels(df):
+    """
+    Store 'Product provider' and 'Product' as categoricals.
+
+    There are only a handful of distinct providers and products, so the integer-coded columns
+    are smaller and make the comparisons, isin and unique calls in the analysis cheaper.
+    Conversion happens once inside the cached loaders; code should not modify the categories.
+    """
+    if df.empty:
+        return df
+    return df.astype({'Product provider': 'category', 'Product': 'category'})
+
+# Streamlit reruns the whole script on every widget change. The analysis functions are pure,
+# so their results are memoized on their inputs to avoid recomputing them on each rerun.
+# The dataframe is passed as _df, which Streamlit does not hash; df_key must identify its
+# contents instead (data version, SSB holdings and selected products), so each lookup only
+# hashes a small tuple rather than the whole frame. Entries for an old data version are never
+# looked up again, so they expire with the shortest loader TTL and the cache is size-capped.
+@st.cache_data(ttl=21600, max_entries=64)
+def cached_best_summary(df_key, _df, investment_amount, min_tenure, max_tenure):
+    return analysis.best_summary(_df, investment_amount, min_tenure, max_tenure)
+
+@st.cache_data(ttl=21600, max_entries=64)
+def cached_better_allocation(df_key, _df, investment_amount, tenure):
+    return analysis.better_allocation(_df, investment_amount, tenure)
+
+def select_products(df, product_selections):
+    """
+    Keep rows whose 'Provider - Product' checkbox is ticked.
+
+    Returns the filtered dataframe and the tuple of selected products, which identifies the
+    selection in cache keys.
+    """
+    selected = tuple(product for product, is_selected in product_selections.items() if is_selected)
+    labels = df['Product provider'].astype(str) + ' - ' + df['Product'].astype(str)
+    return df[labels.isin(selected).to_numpy()], selected
 
 class GitHubCache:
     def __init__(self, repo_owner, repo_name, branch="main"):
@@ -46,19 +115,25 @@ class GitHubCache:
         except Exception:
             return None
     
-    @st.cache_data(ttl=3600)  # Cache for 1 hour
     def _fetch_fresh_data(_self, reason=None):
-        """Helper method to fetch fresh data and format it consistently"""
+        """
+        Helper method to fetch fresh data and format it consistently.
+
+        Each source is cached separately with its own TTL, so only sources whose cache
+        has expired are fetched again. The timestamp is that of the oldest source; the key
+        holds every source's timestamp, so it changes whenever any one source is reloaded.
+        """
         message = f"{reason}, fetching fresh data..." if reason else "Fetching fresh data..."
         with st.spinner(message):
-            df, failures, warnings = consolidate.create_combined_df()
+            sources = [load_source(load_bank_data), load_source(load_ssb_data), load_source(load_tbill_data)]
             return {
                 'source': 'direct',
                 'current': {
-                    'df': df,
-                    'failures': failures,
-                    'warnings': warnings,
-                    'timestamp': datetime.now(ZoneInfo("Asia/Singapore"))
+                    'df': with_categorical_labels(consolidate.merge_dataframes([df for df, _, _ in sources])),
+                    'failures': [failure for _, failures, _ in sources for failure in failures],
+                    'warnings': load_mas_warnings(),
+                    'timestamp': min(timestamp for _, _, timestamp in sources),
+                    'key': tuple(timestamp for _, _, timestamp in sources)
                 }
             }
 
@@ -91,13 +166,15 @@ class GitHubCache:
                     'df': pandas.DataFrame,    # The data
                     'failures': list,          # Any fetch failures
                     'warnings': list,          # Any warnings
-                    'timestamp': datetime      # When data was fetched/cached
+                    'timestamp': datetime,     # When data was fetched/cached
+                    'key': hashable            # Changes whenever the data changes
                 },
                 'latest_successful': {         # Only present if current has failures
                     'df': pandas.DataFrame,    # The last successful fetch
                     'failures': list,          # Empty by definition
                     'warnings': list,          # Any warnings from that fetch
-                    'timestamp': datetime      # When this version was fetched
+                    'timestamp': datetime,     # When this version was fetched
+                    'key': hashable            # Changes whenever the data changes
                 }
             }
 
@@ -123,7 +200,7 @@ class GitHubCache:
                 return _self._fetch_fresh_data("Cache data unavailable")
             
             # Process current version
-            current_df = pd.DataFrame(current_data)
+            current_df = with_categorical_labels(pd.DataFrame(current_data))
             current_timestamp = datetime.strptime(current_version["timestamp"], "%Y%m%d_%H%M%S")
             current_timestamp = current_timestamp.replace(tzinfo=ZoneInfo("Asia/Singapore"))
             
@@ -139,13 +216,14 @@ class GitHubCache:
                     'df': current_df,
                     'failures': current_version["fetch_failures"],
                     'warnings': current_version["warnings"],
-                    'timestamp': current_timestamp
+                    'timestamp': current_timestamp,
+                    'key': current_timestamp  # Each cached snapshot is written once under its timestamp
                 }
             }
             
             # If there are failures and a successful version exists, get it too
             if current_version["fetch_failures"] and metadata.get("latest_successful"):
-                latest_successful_data = self._get_file_content("cache/data_latest_successful.json")
+                latest_successful_data = _self._get_file_content("cache/data_latest_successful.json")
                 if latest_successful_data:
                     successful_timestamp = datetime.strptime(
                         metadata['latest_successful']["timestamp"], 
@@ -153,10 +231,11 @@ class GitHubCache:
                     ).replace(tzinfo=ZoneInfo("Asia/Singapore"))
                     
                     result['latest_successful'] = {
-                        'df': pd.DataFrame(latest_successful_data),
+                        'df': with_categorical_labels(pd.DataFrame(latest_successful_data)),
                         'failures': [],  # By definition, latest successful has no failures
                         'warnings': metadata['latest_successful']["warnings"],
-                        'timestamp': successful_timestamp
+                        'timestamp': successful_timestamp,
+                        'key': successful_timestamp
                     }
             
             return result
@@ -233,6 +312,7 @@ def main():
     fetch_failures = versions['current']['failures']
     warnings = versions['current']['warnings']
     data_timestamp = versions['current']['timestamp']
+    data_version = versions['current']['key']
 
     # Only show option to use latest successful version if:
     # 1. We're using cached data, not direct fetch (cahched data available and not old)
@@ -254,6 +334,7 @@ def main():
             fetch_failures = successful_version['failures']
             warnings = successful_version['warnings']
             data_timestamp = successful_version['timestamp']
+            data_version = successful_version['key']
     
     # Display data source and timestamp in sidebar
     source_text = "Directly fetched" if versions['source'] == 'direct' else "From cache"
@@ -276,6 +357,14 @@ def main():
     else:
         st.error("Could not load financial data. Please check your internet connection or try again later.")
         return
+
+    # Page-independent lookups are kept in the session and only rebuilt when the data version
+    # changes, rather than rescanning combined_df on every rerun
+    data_key = (versions['source'], data_version)
+    if st.session_state.get('data_key') != data_key:
+        st.session_state.data_key = data_key
+        st.session_state.providers = tuple(combined_df['Product provider'].unique())
+        st.session_state.products_list = analysis.products(combined_df)
     
     # Page-specific analyses
     if page == "Home":
@@ -342,7 +431,7 @@ def main():
         
         # Display unique products
         st.subheader("Unique Products in our Dataset")
-        products_list = analysis.products(combined_df)
+        products_list = st.session_state.products_list
         st.write(products_list)
 
         # Plot all rates
@@ -357,11 +446,11 @@ def main():
         
         # Plot. Limit size of plot to center 3/5 of page width
         try:
-            analysis.plot_rates_vs_tenure(combined_df, investment_amount, min_tenure, max_tenure)
+            fig = analysis.plot_rates_vs_tenure(combined_df, investment_amount, min_tenure, max_tenure, show=False)
             col1, col2, col3 = st.columns([1,3,1])
             with col2:
-                st.pyplot(plt.gcf())
-            plt.close()
+                st.pyplot(fig)
+            plt.close(fig)
         except ValueError as e:
             st.error(str(e))
         
@@ -383,7 +472,7 @@ def main():
         
         # Add product selection checkboxes
         st.markdown("**Select Products to Include:**")
-        products_list = analysis.products(combined_df)
+        products_list = st.session_state.products_list
         product_selections = {}
         col1, col2 = st.columns(2)
         for i, product in enumerate(products_list):
@@ -391,8 +480,8 @@ def main():
                 product_selections[product] = st.checkbox(product, value=True)
 
         # Filter dataframe based on selections
-        filtered_df = combined_df[combined_df.apply(lambda row: 
-            product_selections[f"{row['Product provider']} - {row['Product']}"], axis=1)]
+        filtered_df, selected_products = select_products(combined_df, product_selections)
+        filtered_key = (st.session_state.data_key, current_ssb_holdings, selected_products)
 
         # Best returns section
         st.subheader(f"Best Returns for S${investment_amount:,}")
@@ -408,11 +497,17 @@ def main():
         amount of investment to them given the investment amount, and assume the remaining cash 
         earns no return.
         """)
+        # Both tables share one filtering pass
         try:
-            best_returns_df = analysis.best_returns(filtered_df, investment_amount, min_tenure, max_tenure)
-            st.dataframe(best_returns_df)
+            best_rates_df, best_returns_df = cached_best_summary(filtered_key, filtered_df, investment_amount, min_tenure, max_tenure)
+            summary_error = None
         except ValueError as e:
-            st.error(str(e))
+            summary_error = str(e)
+
+        if summary_error is None:
+            st.dataframe(best_returns_df)
+        else:
+            st.error(summary_error)
     
         # Best rates section
         st.subheader(f"Best Rates for S${investment_amount:,}")
@@ -423,16 +518,17 @@ def main():
         as the full amount of cash cannot be invested in product A but can be fully invested into product B.
         """)
         try:
-            best_rates_df = analysis.best_rates(filtered_df, investment_amount, min_tenure, max_tenure)
+            if summary_error is not None:
+                raise ValueError(summary_error)
             st.dataframe(best_rates_df)
 
             # Plot best rates
             st.markdown("**Plot of best rates**")
-            analysis.plot_best_rates(filtered_df, investment_amount, min_tenure, max_tenure)
+            fig = analysis.plot_best_rates(filtered_df, investment_amount, min_tenure, max_tenure, show=False)
             col1, col2, col3 = st.columns([1,3,1])
             with col2:
-                st.pyplot(plt.gcf())
-            plt.close()
+                st.pyplot(fig)
+            plt.close(fig)
 
         except ValueError as e:
             st.error(str(e))
@@ -445,7 +541,7 @@ def main():
         
         # Add product selection checkboxes
         st.markdown("**Select Products to Include:**")
-        products_list = analysis.products(combined_df)
+        products_list = st.session_state.products_list
         product_selections = {}
         col1, col2 = st.columns(2)
         for i, product in enumerate(products_list):
@@ -453,8 +549,8 @@ def main():
                 product_selections[product] = st.checkbox(product, value=True)
 
         # Filter dataframe based on selections
-        filtered_df = combined_df[combined_df.apply(lambda row: 
-            product_selections[f"{row['Product provider']} - {row['Product']}"], axis=1)]
+        filtered_df, selected_products = select_products(combined_df, product_selections)
+        filtered_key = (st.session_state.data_key, current_ssb_holdings, selected_products)
 
         # Better Allocation section
         st.subheader(f"Best Allocation for S${investment_amount:,}")
@@ -467,7 +563,7 @@ def main():
         from the globally optimal allocation. 
         """)
         try:
-            allocation_df = analysis.better_allocation(filtered_df, investment_amount, tenure)
+            allocation_df = cached_better_allocation(filtered_key, filtered_df, investment_amount, tenure)
             st.dataframe(allocation_df)
         except ValueError as e:
             st.error(str(e))
@@ -485,21 +581,21 @@ def main():
         
         # Plot better_allocation strategy rates alone
         try:
-            analysis.plot_better_allocation_strategy(filtered_df, investment_amount, min_tenure, max_tenure)
+            fig = analysis.plot_better_allocation_strategy(filtered_df, investment_amount, min_tenure, max_tenure, show=False)
             col1, col2, col3 = st.columns([1,3,1])
             with col2:
-                st.pyplot(plt.gcf())
-            plt.close()
+                st.pyplot(fig)
+            plt.close(fig)
         except ValueError as e:
             st.error(str(e))
         
         # Plot better_allocation strategy and pure rates
         try:
-            analysis.plot_pure_and_better_allocation_strategy_rates(filtered_df, investment_amount, min_tenure, max_tenure)
+            fig = analysis.plot_pure_and_better_allocation_strategy_rates(filtered_df, investment_amount, min_tenure, max_tenure, show=False)
             col1, col2, col3 = st.columns([1,3,1])
             with col2:
-                st.pyplot(plt.gcf())
-            plt.close()
+                st.pyplot(fig)
+            plt.close(fig)
         except ValueError as e:
             st.error(str(e))
 
@@ -508,16 +604,16 @@ def main():
         st.markdown("View rates offered across deposit ranges for any given provider:")
 
         # Provider selector
-        providers = combined_df['Product provider'].unique()
+        providers = st.session_state.providers
         selected_provider = st.selectbox("Select Provider", providers)
         
         # Plot provider-specific offerings
         try:
-            analysis.plot_bank_offerings_with_fuzz(combined_df, selected_provider)
+            fig = analysis.plot_bank_offerings_with_fuzz(combined_df, selected_provider, show=False)
             col1, col2, col3 = st.columns([1,3,1])
             with col2:
-                st.pyplot(plt.gcf())
-            plt.close()
+                st.pyplot(fig)
+            plt.close(fig)
         except ValueError as e:
             st.error(str(e))
     
@@ -528,8 +624,13 @@ def main():
         # Tenure selector
         tenure = st.number_input("Select Tenure (months)", min_value=0, max_value=120, value=6)
         
-        # Filter dataframe for selected tenure
-        tenure_df = combined_df[combined_df['Tenure'] == tenure]
+        # Split the data by tenure once per data version and SSB holdings (which change the SSB bounds
+        # shown below), so stepping through tenures is a dictionary lookup rather than a full scan
+        groups_key = (st.session_state.data_key, current_ssb_holdings)
+        if st.session_state.get('tenure_groups_key') != groups_key:
+            st.session_state.tenure_groups_key = groups_key
+            st.session_state.tenure_groups = dict(tuple(combined_df.groupby('Tenure', sort=False)))
+        tenure_df = st.session_state.tenure_groups.get(tenure, combined_df.iloc[:0])
         
         st.subheader(f"Rates for {tenure} Months")
         st.dataframe(tenure_df[[
@@ -540,13 +641,17 @@ def main():
         # Bar plot of rates
         st.markdown(f"**Plot of rate ranges across providers for {tenure} months tenure**")
         st.markdown("Each dot represents a rate offered for a specific deposit range:")
-        plt.figure(figsize=(9, 4))
-        sns.stripplot(x='Product provider', y='Rate', data=tenure_df, size=4)
-        plt.title(f'Rates for {tenure} Months Across Providers')
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        st.pyplot(plt.gcf())
-        plt.close()
+        fig, ax = plt.subplots(figsize=(9, 4))
+        # Only plot providers offering this tenure, in order of appearance as for string columns
+        sns.stripplot(
+            x='Product provider', y='Rate', data=tenure_df, size=4, 
+            order=tenure_df['Product provider'].unique(), ax=ax
+            )
+        ax.set_title(f'Rates for {tenure} Months Across Providers')
+        ax.tick_params(axis='x', rotation=45)
+        fig.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -5,9 +5,13 @@ from unittest.mock import patch, Mock, call
 from sgfixedincome_pkg import analysis, equations
 import matplotlib
 matplotlib.use('Agg')  # Set non-interactive backend before other matplotlib imports
+import matplotlib.figure
+import matplotlib.pyplot
 
-# Fixture for common test data
-@pytest.fixture
+# Fixture for common test data. Built once per module since no analysis function modifies
+# its input (see test_analysis_functions_leave_input_unchanged); tests that need to modify it
+# should work on sample_df.copy().
+@pytest.fixture(scope="module")
 def sample_df():
     return pd.DataFrame({
         'Tenure': [1, 1, 6, 6, 12, 12, 6, 12, 24],
@@ -20,6 +24,16 @@ def sample_df():
                    'Fixed Deposit', 'Fixed Deposit', 'T-bill BS24124Z', 'SSB GX25010E', 'SSB GX25010E']
     })
 
+def test_analysis_functions_leave_input_unchanged(sample_df):
+    """Test that analysis functions do not modify the dataframe passed in"""
+    original = sample_df.copy()
+    analysis.filter_df(sample_df, investment_amount=5000, consider_tbills=False)
+    analysis.best_summary(sample_df, investment_amount=10000)
+    analysis.better_allocation(sample_df, investment_amount=10000, tenure=6)
+    analysis.products(sample_df)
+    matplotlib.pyplot.close(analysis.plot_rates_vs_tenure(sample_df, investment_amount=10000, show=False))
+    pd.testing.assert_frame_equal(sample_df, original)
+
 # Tests for filter_df function
 def test_filter_df_investment_amount(sample_df):
     """Test filtering by investment amount"""
@@ -61,20 +75,27 @@ def test_filter_df_product_types(sample_df):
     """Test filtering by product types"""
     # Test excluding T-bills
     result = analysis.filter_df(sample_df, consider_tbills=False)
-    assert not any('T-bill' in product for product in result['Product'])
+    assert not result['Product'].str.contains('T-bill', regex=False).any()
     
     # Test excluding SSBs
     result = analysis.filter_df(sample_df, consider_ssbs=False)
-    assert not any('SSB' in product for product in result['Product'])
+    assert not result['Product'].str.contains('SSB', regex=False).any()
     
     # Test excluding Fixed Deposits
     result = analysis.filter_df(sample_df, consider_fd=False)
-    assert not any('Fixed Deposit' in product for product in result['Product'])
+    assert not result['Product'].str.contains('Fixed Deposit', regex=False).any()
     
     # Test excluding all product types
     with pytest.raises(ValueError):
         analysis.filter_df(sample_df, consider_tbills=False, consider_ssbs=False, consider_fd=False)
 
+def test_filter_df_categorical_columns(sample_df):
+    """Test that product filters give the same result for categorical string columns"""
+    categorical_df = sample_df.astype({'Product provider': 'category', 'Product': 'category'})
+    expected = analysis.filter_df(sample_df, consider_tbills=False, include_providers=['DBS', 'MAS'])
+    result = analysis.filter_df(categorical_df, consider_tbills=False, include_providers=['DBS', 'MAS'])
+    pd.testing.assert_frame_equal(result.astype(expected.dtypes.to_dict()), expected)
+
 def test_filter_df_providers(sample_df):
     """Test filtering by providers"""
     # Test including specific providers
@@ -146,7 +167,35 @@ def test_best_rates_tenure_filter(sample_df):
     assert all(result['Tenure'] >= 6)
     assert all(result['Tenure'] <= 12)
 
+def test_best_summary_matches_separate_calls(sample_df):
+    """Test that best_summary returns the same tables as best_rates and best_returns"""
+    rates_df, returns_df = analysis.best_summary(sample_df, investment_amount=10000, min_tenure=3)
+    pd.testing.assert_frame_equal(rates_df, analysis.best_rates(sample_df, 10000, min_tenure=3))
+    pd.testing.assert_frame_equal(returns_df, analysis.best_returns(sample_df, 10000, min_tenure=3))
+
+def test_best_rates_arrays(sample_df):
+    """Test that best_rates_arrays matches the best_rates DataFrame"""
+    tenures, rates, labels = analysis.best_rates_arrays(sample_df, investment_amount=10000)
+    expected = analysis.best_rates(sample_df, investment_amount=10000)
+    
+    np.testing.assert_array_equal(tenures, expected['Tenure'])
+    np.testing.assert_array_equal(rates, expected['Rate'])
+    assert list(labels) == (expected['Product provider'] + ' - ' + expected['Product']).tolist()
+
 # Tests for products function
+def test_pair_labels():
+    """
+    Test that _pair_labels joins only observed pairs, keeps the index and gives NaN for missing values.
+    """
+    first = pd.Series([1000.0, np.nan, 1000.0, 50000.0], index=[3, 5, 7, 9])
+    second = pd.Series([9999.0, 9999.0, 9999.0, np.nan], index=[3, 5, 7, 9])
+    labels = analysis._pair_labels(first, second, '-')
+
+    assert labels.index.tolist() == [3, 5, 7, 9]
+    assert labels[3] == labels[7] == "1000.0-9999.0"
+    assert labels[[5, 9]].isna().all()
+    assert analysis._pair_labels(first.iloc[:0], second.iloc[:0], '-').empty
+
 def test_products(sample_df):
     """Test products function"""
     result = analysis.products(sample_df)
@@ -186,7 +235,19 @@ def test_plot_rates_vs_tenure(mock_lineplot, mock_show, sample_df):
 
 @pytest.mark.filterwarnings("ignore::UserWarning")
 @patch('matplotlib.pyplot.show')
-@patch('matplotlib.pyplot.plot')
+@patch('seaborn.lineplot')
+def test_plot_rates_vs_tenure_labels(mock_lineplot, mock_show, sample_df):
+    """Test that plot_rates_vs_tenure labels each row by provider and product, also for categorical columns"""
+    for df in [sample_df, sample_df.astype({'Product provider': 'category', 'Product': 'category'})]:
+        analysis.plot_rates_vs_tenure(df, investment_amount=10000)
+        
+        plotted = mock_lineplot.call_args.kwargs['data']
+        expected = (plotted['Product provider'].astype(str) + ' - ' + plotted['Product'].astype(str)).tolist()
+        assert plotted['Product Combination'].tolist() == expected
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@patch('matplotlib.pyplot.show')
+@patch('matplotlib.axes.Axes.plot')
 @patch('seaborn.scatterplot')
 def test_plot_best_rates(mock_scatterplot, mock_plot, mock_show, sample_df):
     """Test that plot_best_rates runs with correct arguments"""
@@ -223,6 +284,27 @@ def test_plot_bank_offerings_with_fuzz(mock_lineplot, mock_show, sample_df):
     # Verify show was called
     mock_show.assert_called_once()
 
+@pytest.mark.filterwarnings("ignore::UserWarning")
+@patch('matplotlib.pyplot.show')
+def test_plot_returns_figure_without_showing(mock_show, sample_df):
+    """Test that plot functions return their figure and skip plt.show() when show=False"""
+    fig = analysis.plot_rates_vs_tenure(sample_df, investment_amount=10000, show=False)
+    
+    assert isinstance(fig, matplotlib.figure.Figure)
+    assert fig.axes[0].get_xlabel() == 'Tenure (Months)'
+    mock_show.assert_not_called()
+    matplotlib.pyplot.close(fig)
+
+def test_plot_on_existing_axes(sample_df):
+    """Test that plot functions draw on a caller-supplied Axes instead of creating a figure"""
+    fig, (ax1, ax2) = matplotlib.pyplot.subplots(1, 2)
+    result = analysis.plot_best_rates(sample_df, investment_amount=10000, show=False, ax=ax2)
+
+    assert result is fig
+    assert ax2.get_xlabel() == 'Tenure (months)'
+    assert not ax1.has_data()
+    matplotlib.pyplot.close(fig)
+
 def test_plot_bank_offerings_invalid_provider(sample_df):
     """Test that appropriate error is raised for invalid provider"""
     with pytest.raises(ValueError):
@@ -298,7 +380,7 @@ def test_better_allocation_expected_returns(sample_df):
 
 @pytest.mark.filterwarnings("ignore::UserWarning")
 @patch('matplotlib.pyplot.show')
-@patch('matplotlib.pyplot.plot')
+@patch('matplotlib.axes.Axes.plot')
 def test_plot_better_allocation_strategy(mock_plot, mock_show, sample_df):
     """Test that plot_better_allocation_strategy runs with correct arguments"""
     
@@ -323,7 +405,7 @@ def test_plot_better_allocation_strategy(mock_plot, mock_show, sample_df):
 
 @pytest.mark.filterwarnings("ignore::UserWarning")
 @patch('matplotlib.pyplot.show')
-@patch('matplotlib.pyplot.plot')
+@patch('matplotlib.axes.Axes.plot')
 @patch('seaborn.scatterplot')
 def test_plot_pure_and_better_allocation_strategy_rates(
     mock_scatterplot, mock_plot, mock_show, sample_df
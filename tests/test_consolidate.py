@@ -144,7 +144,7 @@ def sample_df_columns():
 def test_create_combined_df_success(mock_client, sample_df_columns):
     # Mock the API client responses
     mock_client_instance = Mock()
-    mock_client.return_value = mock_client_instance
+    mock_client.return_value.__enter__.return_value = mock_client_instance
     
     # Mock SSB related methods
     mock_client_instance.get_latest_ssb_issue_code.return_value = "GX24060A"
@@ -183,11 +183,20 @@ def test_create_combined_df_success(mock_client, sample_df_columns):
         assert not failures
         assert isinstance(warnings, list)
 
+@patch('sgfixedincome_pkg.consolidate.fetch_ssb_data', side_effect=RuntimeError("Unexpected error"))
+@patch('sgfixedincome_pkg.consolidate.MAS_bondsandbills_APIClient')
+def test_create_combined_df_closes_client_on_error(mock_client, mock_fetch_ssb):
+    """Test that the MAS API client is closed even when fetching raises"""
+    with patch('sgfixedincome_pkg.consolidate.create_banks_df', return_value=(pd.DataFrame(), [])):
+        with pytest.raises(RuntimeError):
+            consolidate.create_combined_df(scrape_inputs=[])
+    mock_client.return_value.__exit__.assert_called_once()
+
 @patch('sgfixedincome_pkg.consolidate.MAS_bondsandbills_APIClient')
 def test_create_combined_df_mixed_success_failure(mock_client):
     """Test scenario where bank scraping succeeds but SSB and T-bill API calls fail"""
     mock_client_instance = Mock()
-    mock_client.return_value = mock_client_instance
+    mock_client.return_value.__enter__.return_value = mock_client_instance
     
     # Mock SSB API failure
     mock_client_instance.get_latest_ssb_issue_code.side_effect = Exception("SSB API Error")
@@ -241,7 +250,7 @@ def test_create_combined_df_mixed_success_failure(mock_client):
 def test_create_combined_df_tbill_warning_only(mock_client):
     """Test scenario where all data is retrieved successfully but only T-bill warning is raised"""
     mock_client_instance = Mock()
-    mock_client.return_value = mock_client_instance
+    mock_client.return_value.__enter__.return_value = mock_client_instance
     
     # Mock successful SSB API calls
     mock_client_instance.get_latest_ssb_issue_code.return_value = "GX24060A"
@@ -303,4 +312,23 @@ def test_create_combined_df_tbill_warning_only(mock_client):
         
         # Verify only T-bill warning was raised
         assert len(warnings) == 1, "Expected exactly one warning"
-        assert warnings[0] == "Sudden yield change detected"
\ No newline at end of file
+        assert warnings[0] == "Sudden yield change detected"
+def test_fetch_mas_warnings():
+    """Date-dependent checks run on their own and can be skipped when fetching data"""
+    mock_client = Mock()
+    mock_client.past_last_day_to_apply_ssb_warning.side_effect = Warning("SSB deadline passed")
+    mock_client.sudden_6m_tbill_yield_change_warning.side_effect = Warning("Sudden yield change detected")
+
+    assert consolidate.fetch_mas_warnings(mock_client) == [
+        "SSB deadline passed", "Sudden yield change detected"
+    ]
+
+    mock_client.get_most_recent_6m_tbill.return_value = {
+        "issue_code": "BS24123F",
+        "auction_tenor": 0.5,
+        "cutoff_yield": 3.08
+    }
+    mock_client.sudden_6m_tbill_yield_change_warning.reset_mock()
+    tbill_df, failures, warnings = consolidate.fetch_tbill_data(mock_client, check_warnings=False)
+    assert not tbill_df.empty and failures == [] and warnings == []
+    mock_client.sudden_6m_tbill_yield_change_warning.assert_not_called()
@@ -1,5 +1,6 @@
 from sgfixedincome_pkg import equations
 import pytest
+import numpy as np
 
 # Test valid cases for calculate_dollar_return
 @pytest.mark.parametrize(
@@ -18,6 +19,20 @@ def test_calculate_dollar_return_valid(investment, rate, tenure, expected):
     # This should be fine despite float imprecision in python as our function rounds off to 2 d.p.
     assert actual == expected
 
+# Test vectorized inputs for calculate_dollar_return
+def test_calculate_dollar_return_vectorized():
+    """
+    Test calculate_dollar_return with array inputs to verify element-wise results match scalar calls.
+    """
+    investments = np.array([5000, 8000, 0])
+    rates = np.array([1.5, 0, 3.1])
+    actual = equations.calculate_dollar_return(investments, rates, 6)
+    expected = [equations.calculate_dollar_return(i, r, 6) for i, r in zip(investments, rates)]
+    np.testing.assert_array_equal(actual, expected)
+
+    with pytest.raises(ValueError):
+        equations.calculate_dollar_return(np.array([1000, -1000]), 1.2, 12)  # One negative investment
+
 # Test invalid cases for calculate_dollar_return
 def test_calculate_dollar_return_invalid():
     """
@@ -48,6 +63,25 @@ def test_calculate_per_annum_rate_valid(total_percentage_return, tenure, expecte
     # This should be fine despite float imprecision in python as our function rounds off to 2 d.p.
     assert actual == expected
 
+# Test vectorized inputs for calculate_per_annum_rate
+def test_calculate_per_annum_rate_vectorized():
+    """
+    Test calculate_per_annum_rate with array inputs to verify element-wise results match scalar calls.
+    """
+    total_percentage_returns = np.array([3.1, 0, 1.5])
+    tenures = np.array([16, 2, 6])
+    actual = equations.calculate_per_annum_rate(total_percentage_returns, tenures)
+    expected = [equations.calculate_per_annum_rate(r, t) for r, t in zip(total_percentage_returns, tenures)]
+    np.testing.assert_array_equal(actual, expected)
+
+    # Plain lists behave like arrays
+    np.testing.assert_array_equal(
+        equations.calculate_per_annum_rate(total_percentage_returns.tolist(), tenures.tolist()), expected
+        )
+
+    with pytest.raises(ValueError):
+        equations.calculate_per_annum_rate(total_percentage_returns, np.array([12, 0, 6]))  # One zero tenure
+
 # Test invalid cases for calculate_per_annum_rate
 def test_calculate_per_annum_rate_invalid():
     """
@@ -1,248 +1,366 @@
 from sgfixedincome_pkg import mas_api_client
 import pytest
+import numpy as np
 import pandas as pd
 import requests
-from unittest.mock import patch, Mock
-from datetime import datetime
-import pytz
+from unittest.mock import patch
+from datetime import datetime, timedelta
+import json
+from concurrent.futures import ThreadPoolExecutor
 
-def test_initialization():
+_TODAY = datetime.now().date()
+
+@pytest.fixture(scope="module")
+def client():
+    """
+    A single MAS_bondsandbills_APIClient shared by the tests in this module.
+    Methods are patched per test, so sharing the instance is safe. SGFI_CACHE_DIR is unset
+    while it is built, so tests never read or write a developer's response cache.
+    """
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.delenv("SGFI_CACHE_DIR", raising=False)
+        client = mas_api_client.MAS_bondsandbills_APIClient()
+    yield client
+    client.close()
+
+def _json_response(payload, status_code=200, headers=None):
+    """
+    Build a real requests.Response carrying a JSON body, to be returned from a patched Session.get.
+    """
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b"" if payload is None else json.dumps(payload).encode()
+    response.headers.update(headers or {})
+    return response
+
+def test_initialization(client):
     """
     Test that MAS_bondsandbills_APIClient correctly initializes an API
     client for Monetary Authority of Singapore (MAS) bonds and bills endpoints.
     """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
     assert client.base_url == "https://eservices.mas.gov.sg/statistics/api/v1/bondsandbills/m/"
 
-def test_fetch_data_success():
+def test_fetch_data_success(client):
     """
     Test successful API data fetching with fetch_data method.
     Verifies both the returned data and that the correct URL and parameters were used.
     """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
     base_url = "https://eservices.mas.gov.sg/statistics/api/v1/bondsandbills/m/"
     
-    # Mock the requests.get response
-    mock_response = Mock()
-    mock_response.json.return_value = {
+    # Response returned by the session's get
+    payload = {
         "success": True,
         "result": {
             "total": 1,
             "records": [{"test": "data"}]
         }
     }
-    mock_response.raise_for_status.return_value = None
     
-    with patch('requests.get', return_value=mock_response) as mock_get:
+    with patch.object(requests.Session, 'get', return_value=_json_response(payload)) as mock_get:
         # Test with no parameters
         endpoint = "test_endpoint"
         result = client.fetch_data(endpoint)
-        assert result == mock_response.json.return_value
+        assert result == payload
         
-        # Verify requests.get was called with correct URL
-        mock_get.assert_called_with(f"{base_url}{endpoint}", params=None)
+        # Verify the session's get was called with correct URL
+        mock_get.assert_called_with(f"{base_url}{endpoint}", params=None, headers=None, timeout=client.timeout)
         
         # Test with parameters
         params = {"param1": "value1", "param2": "value2"}
         result = client.fetch_data(endpoint, params=params)
-        assert result == mock_response.json.return_value
+        assert result == payload
         
-        # Verify requests.get was called with correct URL and parameters
-        mock_get.assert_called_with(f"{base_url}{endpoint}", params=params)
+        # Verify the session's get was called with correct URL and parameters
+        mock_get.assert_called_with(f"{base_url}{endpoint}", params=params, headers=None, timeout=client.timeout)
         
         # Verify the total number of calls
         assert mock_get.call_count == 2
 
-def test_fetch_data_http_error():
+def test_fetch_data_http_error(client):
     """
     Test fetch_data method handling of HTTP errors.
     """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
-    
-    # Mock requests.get to raise an HTTPError
-    mock_response = Mock()
-    mock_response.raise_for_status.side_effect = requests.HTTPError("404 Client Error")
-    
-    with patch('requests.get', return_value=mock_response):
+    # A 404 response makes raise_for_status raise an HTTPError
+    with patch.object(requests.Session, 'get', return_value=_json_response(None, status_code=404)):
         with pytest.raises(requests.HTTPError):
             client.fetch_data("test_endpoint")
 
-@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "fetch_data")
-def test_get_latest_ssb_details(mock_fetch_data):
+def test_fetch_data_cache(tmp_path):
     """
-    Test that get_latest_ssb_details extracts dictionary record from 
-    nested dictionary structure obtained from API get request.
+    Test that cacheable endpoints are served from the on-disk cache until they expire or are refreshed.
     """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
-    mock_fetch_data.return_value = { # Mock the return from fetch_data()
-        "success": True,
-        "result": {
-            "total": 1,
-            "records": [{
-                "issue_code": "GX25010E",
-                "isin_code": "SGXZ30907869",
-                "last_day_to_apply": "2024-12-26"
-            }]
-        }
-    }
-    ssb_details = client.get_latest_ssb_details()
-    assert ssb_details == {
-        "issue_code": "GX25010E",
-        "isin_code": "SGXZ30907869",
-        "last_day_to_apply": "2024-12-26"
-    }
+    client = mas_api_client.MAS_bondsandbills_APIClient(cache_dir=str(tmp_path))
+    params = {"rows": 1, "sort": "issue_date desc"}
+    payload = {"result": {"records": [{"issue_code": "GX24120N"}]}}
 
-@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "get_latest_ssb_details")
-def test_get_latest_ssb_issue_code(mock_get_latest_ssb_details):
+    with patch.object(requests.Session, 'get', return_value=_json_response(payload)) as mock_get:
+        # Second call is a cache hit, whatever the order of the parameters
+        assert client.fetch_data("listsavingbonds", params) == payload
+        assert client.fetch_data("listsavingbonds", dict(reversed(params.items()))) == payload
+        assert mock_get.call_count == 1
+
+        # force_refresh and endpoints without a TTL always go to the API
+        client.fetch_data("listsavingbonds", params, force_refresh=True)
+        client.fetch_data("test_endpoint")
+        client.fetch_data("test_endpoint")
+        assert mock_get.call_count == 4
+
+        # Expired entries are fetched again
+        ttl = mas_api_client.CACHE_TTLS["listsavingbonds"]
+        with patch('time.time', return_value=datetime.now().timestamp() + ttl + 1):
+            client.fetch_data("listsavingbonds", params)
+        assert mock_get.call_count == 5
+
+        client.cache.clear()
+        client.fetch_data("listsavingbonds", params)
+        assert mock_get.call_count == 6
+
+def test_fetch_data_conditional_request(tmp_path):
     """
-    Test that get_latest_ssb_issue_code extracts issue code from dictionary.
+    Test that stale cache entries are revalidated with ETag/Last-Modified and reused on a 304.
     """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
-    mock_get_latest_ssb_details.return_value = { # Mock the return from get_latest_ssb_details()
-        "issue_code": "GX25010E",
-        "isin_code": "SGXZ30907869",
-        "last_day_to_apply": "2024-12-26"
-    }
-    issue_code = client.get_latest_ssb_issue_code()
-    assert issue_code == "GX25010E"
+    client = mas_api_client.MAS_bondsandbills_APIClient(cache_dir=str(tmp_path))
+    body = {"result": {"records": [{"issue_code": "GX24120N"}]}}
+    first = _json_response(body, headers={"ETag": '"abc"', "Last-Modified": "Tue, 01 Oct 2024 00:00:00 GMT"})
+    not_modified = _json_response(None, status_code=304)  # Empty body: parsing it would fail
+
+    ttl = mas_api_client.CACHE_TTLS["listsavingbonds"]
+    with patch.object(requests.Session, 'get', side_effect=[first, not_modified]) as mock_get:
+        client.fetch_data("listsavingbonds")
+        with patch('time.time', return_value=datetime.now().timestamp() + ttl + 1):
+            assert client.fetch_data("listsavingbonds") == body
 
-@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "get_latest_ssb_details")
-def test_get_latest_ssb_last_day_to_apply(mock_get_latest_ssb_details):
+        assert mock_get.call_args.kwargs["headers"] == {
+            "If-None-Match": '"abc"', "If-Modified-Since": "Tue, 01 Oct 2024 00:00:00 GMT"
+            }
+
+    # The 304 restarted the TTL and kept the validators
+    entry = client.cache.load("listsavingbonds", None)
+    assert entry["body"] == body and entry["etag"] == '"abc"'
+    assert entry["ts"] > datetime.now().timestamp() + ttl
+
+    # A full 200 response replaces the validators, even when it sends none
+    changed = {"result": {"records": [{"issue_code": "GX25010E"}]}}
+    with patch.object(requests.Session, 'get', return_value=_json_response(changed)):
+        assert client.fetch_data("listsavingbonds", force_refresh=True) == changed
+    entry = client.cache.load("listsavingbonds", None)
+    assert entry["etag"] is None and entry["last_modified"] is None
+
+def test_cache_concurrent_writes(tmp_path):
     """
-    Test that get_latest_ssb_last_day_to_apply extracts last day to apply from dictionary.
+    Test that threads writing the same cache entry never leave a partial or temporary file behind.
     """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
-    mock_get_latest_ssb_details.return_value = { # Mock the return from get_latest_ssb_details()
-        "issue_code": "GX25010E",
-        "isin_code": "SGXZ30907869",
-        "last_day_to_apply": "2024-12-26"
-    }
-    last_day_to_apply = client.get_latest_ssb_last_day_to_apply()
-    assert last_day_to_apply == "2024-12-26"
+    cache = mas_api_client.ResponseCache(str(tmp_path))
+    bodies = [{"result": {"records": [{"n": i}] * 200}} for i in range(16)]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda body: cache.set("listsavingbonds", None, body), bodies))
+
+    assert cache.load("listsavingbonds", None)["body"] in bodies
+    assert [p.suffix for p in tmp_path.iterdir()] == [".json"]
+
+    # Clearing also removes temporary files orphaned by an interrupted write
+    (tmp_path / "orphan.tmp").write_text("{")
+    cache.clear()
+    assert list(tmp_path.iterdir()) == []
 
-@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "fetch_data")
-def test_get_ssb_interest(mock_fetch_data):
+def test_cache_disabled_by_default(monkeypatch, tmp_path):
     """
-    Test that get_ssb_interest extracts dictionary record from nested dictionary structure.
+    Test that responses are only cached when a cache directory is configured.
     """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
-    mock_fetch_data.return_value = { # Mock the return from fetch_data()
-        "success": True,
-        "result": {
-            "total": 1,
-            "records": [{
-                "issue_code": "GX25010E",
-                "year1_coupon": 2.73,
-                "year1_return": 2.73,
-                "year2_coupon": 2.82,
-                "year2_return": 2.77,
-                "year3_coupon": 2.82,
-                "year3_return": 2.79,
-                "year4_coupon": 2.82,
-                "year4_return": 2.8,
-                "year5_coupon": 2.82,
-                "year5_return": 2.8,
-                "year6_coupon": 2.85,
-                "year6_return": 2.81,
-                "year7_coupon": 2.9,
-                "year7_return": 2.82,
-                "year8_coupon": 2.95,
-                "year8_return": 2.84,
-                "year9_coupon": 2.99,
-                "year9_return": 2.85,
-                "year10_coupon": 3.01,
-                "year10_return": 2.86
-            }]
-        }
-    }
-    interest_details = client.get_ssb_interest("GX25010E")
-    assert interest_details == {
-        "issue_code": "GX25010E",
-        "year1_coupon": 2.73,
-        "year1_return": 2.73,
-        "year2_coupon": 2.82,
-        "year2_return": 2.77,
-        "year3_coupon": 2.82,
-        "year3_return": 2.79,
-        "year4_coupon": 2.82,
-        "year4_return": 2.8,
-        "year5_coupon": 2.82,
-        "year5_return": 2.8,
-        "year6_coupon": 2.85,
-        "year6_return": 2.81,
-        "year7_coupon": 2.9,
-        "year7_return": 2.82,
-        "year8_coupon": 2.95,
-        "year8_return": 2.84,
-        "year9_coupon": 2.99,
-        "year9_return": 2.85,
-        "year10_coupon": 3.01,
-        "year10_return": 2.86
-    }
+    monkeypatch.delenv("SGFI_CACHE_DIR", raising=False)
+    assert mas_api_client.MAS_bondsandbills_APIClient().cache is None
+
+    monkeypatch.setenv("SGFI_CACHE_DIR", str(tmp_path))
+    assert mas_api_client.MAS_bondsandbills_APIClient().cache.directory == str(tmp_path)
+
+def test_session_reused_and_closed():
+    """
+    Test that the client keeps one pooled session with retries and closes it when used as a context manager.
+    """
+    with mas_api_client.MAS_bondsandbills_APIClient() as client:
+        adapter = client.session.get_adapter(client.base_url)
+        assert adapter.max_retries.total == 3
+        assert 503 in adapter.max_retries.status_forcelist
+
+    with patch.object(requests.Session, 'close') as mock_close:
+        with mas_api_client.MAS_bondsandbills_APIClient():
+            pass
+        mock_close.assert_called_once()
+
+def test_fetch_many(client):
+    """
+    Test that _fetch_many returns results in call order and propagates exceptions.
+    """
+    assert client._fetch_many([lambda: 1, lambda: "two", lambda: [3]]) == [1, "two", [3]]
+
+    def failing_call():
+        raise requests.HTTPError("500 Server Error")
+
+    with pytest.raises(requests.HTTPError):
+        client._fetch_many([lambda: 1, failing_call])
+
+def _records(record):
+    """
+    Wrap a single record in the nested structure returned by fetch_data().
+    """
+    return {"success": True, "result": {"total": 1, "records": [record]}}
+
+SSB_DETAILS = {
+    "issue_code": "GX25010E",
+    "isin_code": "SGXZ30907869",
+    "last_day_to_apply": "2024-12-26"
+}
+
+SSB_INTEREST = {
+    "issue_code": "GX25010E",
+    "year1_coupon": 2.73,
+    "year1_return": 2.73,
+    "year2_coupon": 2.82,
+    "year2_return": 2.77,
+    "year3_coupon": 2.82,
+    "year3_return": 2.79,
+    "year4_coupon": 2.82,
+    "year4_return": 2.8,
+    "year5_coupon": 2.82,
+    "year5_return": 2.8,
+    "year6_coupon": 2.85,
+    "year6_return": 2.81,
+    "year7_coupon": 2.9,
+    "year7_return": 2.82,
+    "year8_coupon": 2.95,
+    "year8_return": 2.84,
+    "year9_coupon": 2.99,
+    "year9_return": 2.85,
+    "year10_coupon": 3.01,
+    "year10_return": 2.86
+}
+
+SSB_COUPONS = (2.73, 2.82, 2.82, 2.82, 2.82, 2.85, 2.9, 2.95, 2.99, 3.01) # Coupons in SSB_INTEREST
+
+SSB_TENURE_RATES = ( # Expected calculate_ssb_tenure_rates(SSB_COUPONS)["Rate"]
+    2.76, 2.76, 2.76, 2.75, 2.75, 2.75, 2.75, 2.74, 2.74, 2.74, 2.73, 2.73, # First year
+    2.73, 2.74, 2.74, 2.74, 2.74, 2.74, 2.74, 2.74, 2.74, 2.74, 2.74, 2.74,
+    2.74, 2.73, 2.73, 2.73, 2.73, 2.73, 2.73, 2.72, 2.72, 2.72, 2.72, 2.72, 
+    2.71, 2.71, 2.71, 2.71, 2.7, 2.7, 2.7, 2.7, 2.69, 2.69, 2.69, 2.69,
+    2.68, 2.68, 2.68, 2.68, 2.67, 2.67, 2.67, 2.67, 2.66, 2.66, 2.66, 2.66, # Fifth year
+    2.65, 2.65, 2.65, 2.65, 2.65, 2.64, 2.64, 2.64, 2.64, 2.64, 2.63, 2.63,
+    2.63, 2.63, 2.63, 2.62, 2.62, 2.62, 2.62, 2.62, 2.62, 2.61, 2.61, 2.61,
+    2.61, 2.61, 2.61, 2.6, 2.6, 2.6, 2.6, 2.6, 2.6, 2.59, 2.59, 2.59, 
+    2.59, 2.59, 2.59, 2.59, 2.58, 2.58, 2.58, 2.58, 2.58, 2.58, 2.58, 2.57, 
+    2.57, 2.57, 2.57, 2.57, 2.57, 2.57, 2.56, 2.56, 2.56, 2.56, 2.56, 2.56  # Tenth year
+)
 
-@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "get_ssb_interest")
-def test_get_ssb_coupons(mock_get_ssb_interest):
+FLAT_SSB_COUPONS = (3.0, 3.0, 3.0, 3.0, 3.0, 3.0, 3.0, 3.0, 3.0, 3.0) # Same coupon every year
+
+FLAT_SSB_TENURE_RATES = (
+    3.04, 3.04, 3.03, 3.03, 3.03, 3.02, 3.02, 3.01, 3.01, 3.01, 3.0, 3.0,
+    3.0, 2.99, 2.99, 2.99, 2.98, 2.98, 2.97, 2.97, 2.97, 2.96, 2.96, 2.96,
+    2.95, 2.95, 2.95, 2.94, 2.94, 2.94, 2.93, 2.93, 2.92, 2.92, 2.92, 2.91,
+    2.91, 2.91, 2.9, 2.9, 2.9, 2.89, 2.89, 2.89, 2.88, 2.88, 2.88, 2.87,
+    2.87, 2.87, 2.86, 2.86, 2.86, 2.85, 2.85, 2.85, 2.84, 2.84, 2.84, 2.83,
+    2.83, 2.83, 2.83, 2.82, 2.82, 2.82, 2.81, 2.81, 2.81, 2.8, 2.8, 2.8,
+    2.79, 2.79, 2.79, 2.78, 2.78, 2.78, 2.78, 2.77, 2.77, 2.77, 2.76, 2.76,
+    2.76, 2.75, 2.75, 2.75, 2.75, 2.74, 2.74, 2.74, 2.73, 2.73, 2.73, 2.73,
+    2.72, 2.72, 2.72, 2.71, 2.71, 2.71, 2.71, 2.7, 2.7, 2.7, 2.69, 2.69,
+    2.69, 2.69, 2.68, 2.68, 2.68, 2.67, 2.67, 2.67, 2.67, 2.66, 2.66, 2.66
+)
+
+STEEP_SSB_COUPONS = (2.5, 2.7, 2.9, 3.1, 3.2, 3.3, 3.4, 3.5, 3.6, 3.7) # Coupons rising by up to 20bps a year
+
+STEEP_SSB_TENURE_RATES = (
+    2.53, 2.53, 2.52, 2.52, 2.52, 2.52, 2.51, 2.51, 2.51, 2.51, 2.5, 2.5,
+    2.51, 2.52, 2.53, 2.54, 2.55, 2.55, 2.55, 2.56, 2.56, 2.56, 2.57, 2.57,
+    2.58, 2.58, 2.59, 2.6, 2.6, 2.61, 2.61, 2.62, 2.62, 2.62, 2.63, 2.63,
+    2.64, 2.64, 2.65, 2.66, 2.66, 2.67, 2.67, 2.68, 2.68, 2.68, 2.69, 2.69,
+    2.69, 2.7, 2.7, 2.71, 2.71, 2.71, 2.72, 2.72, 2.72, 2.72, 2.73, 2.73,
+    2.73, 2.73, 2.74, 2.74, 2.74, 2.74, 2.75, 2.75, 2.75, 2.75, 2.75, 2.75,
+    2.76, 2.76, 2.76, 2.76, 2.76, 2.77, 2.77, 2.77, 2.77, 2.77, 2.77, 2.77,
+    2.77, 2.78, 2.78, 2.78, 2.78, 2.78, 2.78, 2.78, 2.79, 2.79, 2.79, 2.79,
+    2.79, 2.79, 2.79, 2.79, 2.79, 2.79, 2.8, 2.8, 2.8, 2.8, 2.8, 2.8,
+    2.8, 2.8, 2.8, 2.8, 2.8, 2.8, 2.81, 2.81, 2.81, 2.81, 2.81, 2.81
+)
+
+TBILL_DETAILS = {
+    "issue_code": "BS24124Z",
+    "isin_code": "SGXZ29257813",
+    "cutoff_yield": "3.0"
+}
+
+TBILL_YIELDS = { # Record from the priceandyields endpoint
+    "end_of_period": "2024-11-14",
+    "product_type": "B",
+    "bid_6m_tbill_yield": 3.01,
+    "bid_1y_tbill_yield": 2.73,
+    "bid_2y_bond_yield": 2.84
+}
+
+@pytest.mark.parametrize(
+    "method, args, mock_target, mock_return, expected",
+    [
+        ("get_latest_ssb_details", (), "fetch_data", _records(SSB_DETAILS), SSB_DETAILS),
+        ("get_latest_ssb_issue_code", (), "get_latest_ssb_details", SSB_DETAILS, "GX25010E"),
+        ("get_latest_ssb_last_day_to_apply", (), "get_latest_ssb_details", SSB_DETAILS, "2024-12-26"),
+        ("get_ssb_interest", ("GX25010E",), "fetch_data", _records(SSB_INTEREST), SSB_INTEREST),
+        ("get_most_recent_6m_tbill", (), "fetch_data", _records(TBILL_DETAILS), TBILL_DETAILS),
+        ("get_6m_tbill_bid_yield", (), "fetch_data", _records(TBILL_YIELDS), 3.01),
+    ],
+)
+def test_record_extraction(method, args, mock_target, mock_return, expected, client):
+    """
+    Test that each getter extracts the expected record or field from the
+    response of the method it builds on (usually the nested fetch_data() structure).
+    """
+    with patch.object(mas_api_client.MAS_bondsandbills_APIClient, mock_target, return_value=mock_return, autospec=True):
+        assert getattr(client, method)(*args) == expected
+
+@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "get_ssb_interest", autospec=True)
+def test_get_ssb_coupons(mock_get_ssb_interest, client):
     """
     Test that get_ssb_coupons function extracts coupon list from a SSB coupon and returns dictionary.
     """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
-    mock_get_ssb_interest.return_value = { # Mock the return from get_ssb_interest()
-        "issue_code": "GX25010E",
-        "year1_coupon": 2.73,
-        "year1_return": 2.73,
-        "year2_coupon": 2.82,
-        "year2_return": 2.77,
-        "year3_coupon": 2.82,
-        "year3_return": 2.79,
-        "year4_coupon": 2.82,
-        "year4_return": 2.8,
-        "year5_coupon": 2.82,
-        "year5_return": 2.8,
-        "year6_coupon": 2.85,
-        "year6_return": 2.81,
-        "year7_coupon": 2.9,
-        "year7_return": 2.82,
-        "year8_coupon": 2.95,
-        "year8_return": 2.84,
-        "year9_coupon": 2.99,
-        "year9_return": 2.85,
-        "year10_coupon": 3.01,
-        "year10_return": 2.86
-    }
+    mock_get_ssb_interest.return_value = SSB_INTEREST # Mock the return from get_ssb_interest()
     coupons = client.get_ssb_coupons("GX25010E")
-    assert coupons == [2.73, 2.82, 2.82, 2.82, 2.82, 2.85, 2.9, 2.95, 2.99, 3.01]
+    assert coupons == list(SSB_COUPONS)
+    mock_get_ssb_interest.assert_called_once_with(client, "GX25010E")
 
-def test_calculate_ssb_tenure_rates_valid():
+@pytest.mark.parametrize(
+    "coupons, expected_rates",
+    [
+        (SSB_COUPONS, SSB_TENURE_RATES),
+        (FLAT_SSB_COUPONS, FLAT_SSB_TENURE_RATES),
+        (STEEP_SSB_COUPONS, STEEP_SSB_TENURE_RATES)
+    ],
+    ids=["GX25010E", "flat", "steep"]
+)
+def test_calculate_ssb_tenure_rates_valid(coupons, expected_rates, client):
     """
-    Test calculate_ssb_tenure_rates with a standard set of coupons.
+    Test calculate_ssb_tenure_rates with several realistic sets of coupons.
     Verifies generated DataFrame structure and values aligns with expectations.
     """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
-    coupons = [2.73, 2.82, 2.82, 2.82, 2.82, 2.85, 2.9, 2.95, 2.99, 3.01]
-    result = client.calculate_ssb_tenure_rates(coupons)
+    result = client.calculate_ssb_tenure_rates(list(coupons))
     
     # Check DataFrame properties
     assert isinstance(result, pd.DataFrame), "Result should be a pandas DataFrame"
     assert len(result) == 120, "DataFrame should have exactly 120 rows"
     assert list(result.columns) == ["Tenure", "Rate"], "DataFrame should have Tenure and Rate columns"
     
-    expected_rates = [
-        2.76, 2.76, 2.76, 2.75, 2.75, 2.75, 2.75, 2.74, 2.74, 2.74, 2.73, 2.73, # First year
-        2.73, 2.74, 2.74, 2.74, 2.74, 2.74, 2.74, 2.74, 2.74, 2.74, 2.74, 2.74,
-        2.74, 2.73, 2.73, 2.73, 2.73, 2.73, 2.73, 2.72, 2.72, 2.72, 2.72, 2.72, 
-        2.71, 2.71, 2.71, 2.71, 2.7, 2.7, 2.7, 2.7, 2.69, 2.69, 2.69, 2.69,
-        2.68, 2.68, 2.68, 2.68, 2.67, 2.67, 2.67, 2.67, 2.66, 2.66, 2.66, 2.66, # Fifth year
-        2.65, 2.65, 2.65, 2.65, 2.65, 2.64, 2.64, 2.64, 2.64, 2.64, 2.63, 2.63,
-        2.63, 2.63, 2.63, 2.62, 2.62, 2.62, 2.62, 2.62, 2.62, 2.61, 2.61, 2.61,
-        2.61, 2.61, 2.61, 2.6, 2.6, 2.6, 2.6, 2.6, 2.6, 2.59, 2.59, 2.59, 
-        2.59, 2.59, 2.59, 2.59, 2.58, 2.58, 2.58, 2.58, 2.58, 2.58, 2.58, 2.57, 
-        2.57, 2.57, 2.57, 2.57, 2.57, 2.57, 2.56, 2.56, 2.56, 2.56, 2.56, 2.56  # Tenth year                     
-    ]
-    
-    for i, (_, row) in enumerate(result.iterrows()):
-        assert row['Tenure'] == i + 1, f"Tenure for row {i} should be {i+1}"
-        assert row['Rate'] == expected_rates[i], f"Rate for tenure {row['Tenure']} does not match expected value {expected_rates[i]}."
+    np.testing.assert_array_equal(result['Tenure'].to_numpy(), np.arange(1, 121))
+    assert result['Rate'].to_numpy() == pytest.approx(np.asarray(expected_rates), abs=5e-3)  # Rates are rounded to 2dp
     
+def test_calculate_ssb_tenure_rates_cached():
+    """
+    Test that repeated calls with the same coupons reuse the cached table but return independent copies.
+    """
+    coupons = list(SSB_COUPONS)
+    mas_api_client._ssb_tenure_rates.cache_clear()
+
+    first = mas_api_client.MAS_bondsandbills_APIClient.calculate_ssb_tenure_rates(coupons)
+    first.loc[0, 'Rate'] = 99.0  # Caller mutation must not leak into the cache
+    second = mas_api_client.MAS_bondsandbills_APIClient.calculate_ssb_tenure_rates(list(coupons))
+
+    assert mas_api_client._ssb_tenure_rates.cache_info().hits == 1
+    assert second.loc[0, 'Rate'] == 2.76
+
 @pytest.mark.parametrize(
     "coupons",
     [
@@ -251,64 +369,13 @@ def test_calculate_ssb_tenure_rates_valid():
         [2.7, 2.7, 2.7, 2.8, 2.8, 2.8, 2.9, 2.9, 2.9, 1.0] # Not monotonically increasing
     ]
 )
-def test_calculate_ssb_tenure_rates_invalid(coupons):
+def test_calculate_ssb_tenure_rates_invalid(coupons, client):
     """
     Test that calculate_ssb_tenure_rates raises a ValueError with invalid inputs.
     """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
     with pytest.raises(ValueError):
         client.calculate_ssb_tenure_rates(coupons)
 
-@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "fetch_data")
-def test_get_most_recent_6m_tbill(mock_fetch_data):
-    """
-    Test that get_most_recent_6m_tbill extracts dictionary record from 
-    nested dictionary structure obtained from API get request.
-    """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
-    mock_fetch_data.return_value = { # Mock the return from fetch_data()
-        "success": True,
-        "result": {
-            "total": 1,
-            "records": [{
-                "issue_code": "BS24124Z",
-                "isin_code": "SGXZ29257813",
-                "cutoff_yield": "3.0"
-            }]
-        }
-    }
-    tbill_details = client.get_most_recent_6m_tbill()
-    assert tbill_details == {
-        "issue_code": "BS24124Z",
-        "isin_code": "SGXZ29257813",
-        "cutoff_yield": "3.0"
-    }
-
-@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "fetch_data")
-def test_get_6m_tbill_bid_yield(mock_fetch_data):
-    """
-    Test that get_6m_tbill_bid_yield extracts bid yield from dictionary.
-    """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
-    mock_fetch_data.return_value =  { # Mock the return from fetch_data() priceandyields endpoint
-        "success": True,
-        "result": {
-            "total": 1,
-            "records": [{
-                "end_of_period": "2024-11-14",
-                "product_type": "B",
-                "bid_6m_tbill_yield": 3.01,
-                "bid_1y_tbill_yield": 2.73,
-                "bid_2y_bond_yield": 2.84
-            }]
-        }
-    }
-    bid_yield = client.get_6m_tbill_bid_yield()
-    assert bid_yield == 3.01
-
-import pytest
-from unittest.mock import patch, MagicMock
-
 @pytest.mark.parametrize(
     "bid_yield, cutoff_yield, threshold, expected_warning",
     [
@@ -324,11 +391,11 @@ from unittest.mock import patch, MagicMock
     ],
 )
 @patch("warnings.warn")
-@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "get_6m_tbill_bid_yield")
-@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "get_most_recent_6m_tbill")
+@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "get_6m_tbill_bid_yield", autospec=True)
+@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "get_most_recent_6m_tbill", autospec=True)
 def test_sudden_6m_tbill_yield_change_warning(
     mock_get_most_recent_6m_tbill, mock_get_6m_tbill_bid_yield, 
-    mock_warn, bid_yield, cutoff_yield, threshold, expected_warning
+    mock_warn, bid_yield, cutoff_yield, threshold, expected_warning, client
 ):
     """
     Parameterized test for sudden T-bill yield change warning.
@@ -351,7 +418,6 @@ def test_sudden_6m_tbill_yield_change_warning(
         expect_warning: Whether a warning is expected
     """
     # Mocking the client methods
-    client = mas_api_client.MAS_bondsandbills_APIClient()
     mock_get_6m_tbill_bid_yield.return_value = bid_yield
     mock_get_most_recent_6m_tbill.return_value = {
         "issue_code": "BS24124Z",
@@ -364,27 +430,24 @@ def test_sudden_6m_tbill_yield_change_warning(
 
     # Assert if warnings.warn was called correctly
     if expected_warning:
-        # Check if any call contains the relevant part of the warning
-        assert any(
-            "The difference between the bid yield and the cutoff yield is large"
-            in str(call.args[0])
-            for call in mock_warn.call_args_list
-        ), "Expected warning not found in warnings.warn calls"
+        # Check that a single warning was issued and contains the relevant part of the message
+        mock_warn.assert_called_once()
+        assert "The difference between the bid yield and the cutoff yield is large" in str(mock_warn.call_args.args[0]), \
+            "Expected warning not found in warnings.warn calls"
     else:
         mock_warn.assert_not_called()
 
 @patch("warnings.warn")
-@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "get_6m_tbill_bid_yield")
-@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "get_most_recent_6m_tbill")
+@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "get_6m_tbill_bid_yield", autospec=True)
+@patch.object(mas_api_client.MAS_bondsandbills_APIClient, "get_most_recent_6m_tbill", autospec=True)
 def test_sudden_6m_tbill_yield_change_warning_exception(
-    mock_get_most_recent_6m_tbill, mock_get_6m_tbill_bid_yield, mock_warn
+    mock_get_most_recent_6m_tbill, mock_get_6m_tbill_bid_yield, mock_warn, client
 ):
     """
     Test that a warning is issued when an exception occurs in 
     `sudden_6m_tbill_yield_change_warning`.
     """
     # Mocking the client methods to raise exceptions
-    client = mas_api_client.MAS_bondsandbills_APIClient()
     mock_get_6m_tbill_bid_yield.side_effect = Exception("Simulated error")
     mock_get_most_recent_6m_tbill.return_value = {
         "issue_code": "BS24124Z",
@@ -401,44 +464,42 @@ def test_sudden_6m_tbill_yield_change_warning_exception(
     )
 
 @patch('warnings.warn')
-def test_past_last_day_to_apply_ssb_warning_before_deadline(mock_warn):
+def test_past_last_day_to_apply_ssb_warning_before_deadline(mock_warn, client):
     """
     Test past_last_day_to_apply_ssb_warning when current date is before the deadline.
     """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
     
     # Mock get_latest_ssb_last_day_to_apply to return a future date
-    future_date = (datetime.now().date() + pd.Timedelta(days=7)).strftime('%Y-%m-%d')
-    with patch.object(client, 'get_latest_ssb_last_day_to_apply', return_value=future_date):
+    future_date = (_TODAY + timedelta(days=7)).isoformat()
+    with patch.object(client, 'get_latest_ssb_last_day_to_apply', return_value=future_date, autospec=True):
         client.past_last_day_to_apply_ssb_warning()
         mock_warn.assert_not_called()
 
 @patch('warnings.warn')
-def test_past_last_day_to_apply_ssb_warning_after_deadline(mock_warn):
+def test_past_last_day_to_apply_ssb_warning_after_deadline(mock_warn, client):
     """
     Test past_last_day_to_apply_ssb_warning when current date is after the deadline.
     """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
     
     # Mock get_latest_ssb_last_day_to_apply to return a past date
-    past_date = (datetime.now().date() - pd.Timedelta(days=1)).strftime('%Y-%m-%d')
-    with patch.object(client, 'get_latest_ssb_last_day_to_apply', return_value=past_date):
+    past_date = (_TODAY - timedelta(days=1)).isoformat()
+    with patch.object(client, 'get_latest_ssb_last_day_to_apply', return_value=past_date, autospec=True):
         client.past_last_day_to_apply_ssb_warning()
         mock_warn.assert_called_once()
         assert "The last day to apply for the latest SSB" in str(mock_warn.call_args[0][0])
 
 @patch('warnings.warn')
-def test_past_last_day_to_apply_ssb_warning_exception(mock_warn):
+def test_past_last_day_to_apply_ssb_warning_exception(mock_warn, client):
     """
     Test past_last_day_to_apply_ssb_warning when an exception occurs.
     """
-    client = mas_api_client.MAS_bondsandbills_APIClient()
     
     # Mock get_latest_ssb_last_day_to_apply to raise an exception
     with patch.object(
         client, 
         'get_latest_ssb_last_day_to_apply', 
-        side_effect=Exception("Test error")
+        side_effect=Exception("Test error"),
+        autospec=True
     ):
         client.past_last_day_to_apply_ssb_warning()
         mock_warn.assert_called_once()
@@ -1,11 +1,39 @@
 from sgfixedincome_pkg import scraper
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 import pandas as pd
+import numpy as np
+import functools
 
-def test_fetch_webpage_success(mocker):
+@pytest.fixture(scope="session")
+def parsed_soup():
+    """
+    Returns a memoized parser, so each HTML string is parsed into a BeautifulSoup object once per session.
+    The parsed soups are only read by the tests, never modified.
+    """
+    @functools.lru_cache(maxsize=None)
+    def _parse(html_content):
+        return BeautifulSoup(html_content, 'html.parser')
+    return _parse
+
+@pytest.fixture(scope="module")
+def mock_http_ok():
+    """
+    A fake successful HTTP response shared by the fetch_webpage tests.
+    """
+    return Mock( # Simulates a real HTTP response object
+        status_code=200, # Simulate a successful HTTP request
+        text="""
+        <html><body>
+            <h1>Test Content</h1>
+            <table class="rates-table other-class"><tbody><tr><td>1 mth</td></tr></tbody></table>
+        </body></html>
+        """
+    )
+
+def test_fetch_webpage_success(mocker, mock_http_ok):
     """
     Test that fetch_webpage successfully retrieves and parses HTML content.
     
@@ -13,12 +41,9 @@ def test_fetch_webpage_success(mocker):
     and verifies that the function returns a BeautifulSoup object containing the expected content.
     """
     # Mock the requests.get to return a fake response
-    mock_response = Mock() # creates a mock object to simulate a real HTTP object
-    mock_response.status_code = 200 # simulate a successful HTTP request
-    mock_response.text = "<html><body><h1>Test Content</h1></body></html>"
-    mocker.patch('requests.get', return_value=mock_response)
+    mocker.patch('requests.get', return_value=mock_http_ok)
 
-    # Since requests.get is mocked, it returns the mock_response instead of making a real network request
+    # Since requests.get is mocked, it returns the mock_http_ok instead of making a real network request
     url = "http://example.com"
     soup = scraper.fetch_webpage(url)  # Call the function
 
@@ -26,6 +51,17 @@ def test_fetch_webpage_success(mocker):
     assert isinstance(soup, BeautifulSoup)
     assert soup.h1.text == "Test Content"
 
+def test_fetch_webpage_parse_only(mocker, mock_http_ok):
+    """
+    Test that fetch_webpage only builds the elements matched by a parse_only strainer.
+    """
+    mocker.patch('requests.get', return_value=mock_http_ok)
+
+    soup = scraper.fetch_webpage("http://example.com", parse_only=SoupStrainer("table"))
+
+    assert soup.h1 is None # Skipped while parsing
+    assert len(scraper.extract_table(soup, "rates-table")) == 1
+
 def test_fetch_webpage_failure(mocker):
     """
     Test that fetch_webpage raises an exception when an HTTP request fails.
@@ -135,7 +171,7 @@ def test_fetch_webpage_failure(mocker):
         )
     ]
 )
-def test_extract_table(html_content, table_class, expected_tables, raises_exception):
+def test_extract_table(html_content, table_class, expected_tables, raises_exception, parsed_soup):
     """
     Test extract_table() to ensure it handles finding tables with a given class correctly.
 
@@ -145,7 +181,7 @@ def test_extract_table(html_content, table_class, expected_tables, raises_except
         expected_tables (int): The expected number of tables that should be found with the specified class.
         raises_exception (bool): Whether you expect an exception to be raised (True if exception expected, False if not).
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = parsed_soup(html_content)
 
     if raises_exception:
         with pytest.raises(Exception):
@@ -232,7 +268,7 @@ def test_extract_table(html_content, table_class, expected_tables, raises_except
         )
     ]
 )
-def test_table_to_df(html_content, table_class, expected_df, raises_exception):
+def test_table_to_df(html_content, table_class, expected_df, raises_exception, parsed_soup):
     """
     Parametrized test for extract_table, covering cases with:
     - Headers in <th> tags. Such a table is seen in the DBS website as of December 2024.
@@ -247,7 +283,7 @@ def test_table_to_df(html_content, table_class, expected_df, raises_exception):
         expected_df (pd.DataFrame): The expected output raw pandas DataFrame with raw table data.
         raises_exception (boolean): Whether you expect an exception to be raised.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = parsed_soup(html_content)
     table = soup.find('table', class_=table_class)
     
     if raises_exception: 
@@ -257,116 +293,89 @@ def test_table_to_df(html_content, table_class, expected_df, raises_exception):
         actual_df = scraper.table_to_df(table)
         pd.testing.assert_frame_equal(actual_df, expected_df)
 
-# List of deposit range formats to input into parse_bounds and expected results 
-@pytest.mark.parametrize(
-    "deposit_range, expected_result, raises_exception",
-    [
-        # Valid deposit ranges
-        ("$1,000 - $9,999", (1000.0, 9999.0), False),
-        (">S$20,000 - S$50,000", (20000.01, 50000.0), False),
-        ("Below S$50,000", (0.0, 49999.99), False),
-        ("S$50,000 - S$249,999", (50000.0, 249999.0), False),
-        (">$5,000", (5000.01, 99999999.0), False),
-        ("Above 30,000", (30000.01, 99999999.0), False),
-        
-        # Invalid deposit ranges (should raise exceptions)
-        ("$abc-xyz", None, True),  # Invalid format (non-numeric values)
-        ("period", None, True),  # Invalid format (non-numeric values)
-        ("<$10000-$20000", None, True),  # Invalid format (lower bound cannot start with '<')
-        ("10000 - >20000", None, True),  # Invalid format (upper bound cannot start with '>')
-        ("$50,000", None, True),  # Single value, not a range
-        ("S$10000-S$5,000", None, True)  # Invalid range (upper bound is lower than lower bound)
-    ]
-)
-def test_parse_bounds(deposit_range, expected_result, raises_exception):
-    """
-    Parametrized test for `parse_bounds` function.
-    Tests various valid and invalid deposit range formats.
+# Table of (helper function, arguments, expected result, whether an exception is expected) for the
+# parse_bounds, parse_tenure and clean_rate_value helpers. Invalid inputs should raise a ValueError.
+HELPER_CASES = [
+    # Valid deposit ranges
+    ("parse_bounds", ("$1,000 - $9,999",), (1000.0, 9999.0), False),
+    ("parse_bounds", (">S$20,000 - S$50,000",), (20000.01, 50000.0), False),
+    ("parse_bounds", ("Below S$50,000",), (0.0, 49999.99), False),
+    ("parse_bounds", ("S$50,000 - S$249,999",), (50000.0, 249999.0), False),
+    ("parse_bounds", (">$5,000",), (5000.01, 99999999.0), False),
+    ("parse_bounds", ("Above 30,000",), (30000.01, 99999999.0), False),
 
-    Parameters:
-        deposit_range (str): Deposit range string input value.
-        expected_result (tuple): The expected output tuple with lower and upper bounds as floats.
-        raises_exception (boolean): Whether you expect an exception to be raised.
-    """
-    if raises_exception: # Check that exception is raised for invalid deposit ranges
-        with pytest.raises(ValueError):
-            scraper.parse_bounds(deposit_range)
-    else: # Check result is as expected for valid deposit ranges
-        result = scraper.parse_bounds(deposit_range)
-        assert result == expected_result
+    # Invalid deposit ranges
+    ("parse_bounds", ("$abc-xyz",), None, True),  # Invalid format (non-numeric values)
+    ("parse_bounds", ("period",), None, True),  # Invalid format (non-numeric values)
+    ("parse_bounds", ("<$10000-$20000",), None, True),  # Invalid format (lower bound cannot start with '<')
+    ("parse_bounds", ("10000 - >20000",), None, True),  # Invalid format (upper bound cannot start with '>')
+    ("parse_bounds", ("$50,000",), None, True),  # Single value, not a range
+    ("parse_bounds", ("S$10000-S$5,000",), None, True),  # Invalid range (upper bound is lower than lower bound)
+
+    # Valid tenures (first column value, header)
+    ("parse_tenure", ("1 mth", "Period"), [1], False), # In DBS website as of Dec 2024
+    ("parse_tenure", ("9 mths", "Period"), [9], False), # In DBS website as of Dec 2024
+    ("parse_tenure", ("6-month", "Tenor (% p.a.)"), [6], False), # In UOB website as of Dec 2024
+    ("parse_tenure", ("6-8", "Tenure (months)"), [6, 7, 8], False), # In OCBC website as of Dec 2024
+    ("parse_tenure", ("12", "Tenure (months)"), [12], False), # In OCBC website as of Dec 2024
+
+    # Invalid tenures
+    ("parse_tenure", ("6-12 weeks", "Tenure in weeks"), None, True),
+    ("parse_tenure", ("1 year", "Tenure"), None, True),
+    ("parse_tenure", ("invalid tenure", "Period"), None, True),
+    ("parse_tenure", ("6-8 years", "Tenure (years)"), None, True),
+
+    # Valid rate values
+    ("clean_rate_value", ("1.40%",), 1.4, False),     # Format seen in OCBC website
+    ("clean_rate_value", ("2.9000",), 2.9, False),    # Format seen in DBS website
+    ("clean_rate_value", ("0.90",), 0.9, False),      # Format seen in UOB website
+
+    # 'N.A' rate values
+    ("clean_rate_value", ("N.A",), None, False),      # Format seen in OCBC website
+    ("clean_rate_value", ("n.a.",), None, False),
+    ("clean_rate_value", ("N/a",), None, False),
+    ("clean_rate_value", ("na",), None, False),
+
+    # Invalid rate values
+    ("clean_rate_value", ("Invalid",), None, True),   # Invalid string
+    ("clean_rate_value", ("$500",), None, True),      # String with '$'
+    ("clean_rate_value", ("",), None, True),          # Empty string
+]
 
-# List of header and first column values to input into parse_tenure and expected results
 @pytest.mark.parametrize(
-    "period_str, header_str, expected_result, raises_exception",
-    [
-        # Valid cases
-        ("1 mth", "Period", [1], False), # In DBS website as of Dec 2024
-        ("9 mths", "Period", [9], False), # In DBS website as of Dec 2024
-        ("6-month", "Tenor (% p.a.)", [6], False), # In UOB website as of Dec 2024
-        ("6-8", "Tenure (months)", [6, 7, 8], False), # In OCBC website as of Dec 2024
-        ("12", "Tenure (months)", [12], False), # In OCBC website as of Dec 2024
-        
-        # Invalid cases (should raise ValueError)
-        ("6-12 weeks", "Tenure in weeks", None, True),
-        ("1 year", "Tenure", None, True),
-        ("invalid tenure", "Period", None, True),
-        ("6-8 years", "Tenure (years)", None, True)
-    ]
+    "fn, args, expected_result, raises_exception",
+    HELPER_CASES,
+    ids=[f"{fn}:{'|'.join(args)}" for fn, args, _, _ in HELPER_CASES]
 )
-def test_parse_tenure(period_str, header_str, expected_result, raises_exception):
+def test_scraper_helper(fn, args, expected_result, raises_exception):
     """
-    Parametrized test for the `parse_tenure` function to validate its behavior with 
-    both valid and invalid cases of tenure strings and headers.
+    Table-driven test for the `parse_bounds`, `parse_tenure` and `clean_rate_value` helpers,
+    covering valid inputs and invalid inputs that should raise a ValueError.
 
     Parameters:
-        period_str (str): Tenure period input value.
-        header_str (str): Column header input value.
-        expected_result (list): The expected output list of integer months.
-        raises_exception (boolean): Whether you expect an exception to be raised.
+        fn (str): Name of the scraper helper function to call.
+        args (tuple): Positional arguments passed to the helper.
+        expected_result: The expected output for valid inputs.
+        raises_exception (boolean): Whether you expect a ValueError to be raised.
     """
-    if raises_exception: # Check that ValueError is raised for invalid cases
+    helper = getattr(scraper, fn)
+    if raises_exception: # Check that ValueError is raised for invalid inputs
         with pytest.raises(ValueError):
-            scraper.parse_tenure(period_str, header_str)
-    else: # Check result is as expected for valid cases
-        assert scraper.parse_tenure(period_str, header_str) == expected_result
+            helper(*args)
+    else: # Check result is as expected for valid inputs
+        assert helper(*args) == expected_result
 
-# List of possible inputs into clean_rate_value and expected results
-@pytest.mark.parametrize(
-    "rate_value, expected_result, raises_exception",
-    [
-        # Valid cases
-        ("1.40%", 1.4, False),     # Format seen in OCBC website
-        ("2.9000", 2.9, False),    # Format seen in DBS website              
-        ("0.90", 0.9, False),      # Format seen in UOB website
-        
-        # 'N.A' cases
-        ("N.A", None, False),      # Format seen in OCBC website
-        ("n.a.", None, False),
-        ("N/a", None, False), 
-        ("na", None, False),
-
-        # Invalid cases (should raise ValueError)
-        ("Invalid", None, True),   # Invalid string, should raise ValueError
-        ("$500", None, True),      # String with '$', should raise ValueError
-        ("", None, True),          # Empty string, should raise ValueError
-    ]
-)
-def test_clean_rate_value(rate_value, expected_result, raises_exception):
+def _long_rates(tenures, rate_rows, lower_bounds, upper_bounds):
     """
-    Parametrized test for the `clean_rate_value` function to validate its behavior with 
-    valid, invalid, and N.A. cases of rate values.
-
-    Parameters:
-        rate_value (str or float): The rate value input which may include non-numeric characters
-                                   (e.g., '%', 'N.A.') or be a valid numeric value.
-        expected_result (float or None): The expected output, a cleaned rate value or None.
-        raises_exception (boolean): Whether you expect an exception to be raised. 
+    Builds the long-format DataFrame expected from reshape_table: one row per (tenure, deposit range)
+    pair, where rate_rows[i] holds the rates for tenures[i] across the deposit ranges.
     """
-    if raises_exception: # Check that ValueError is raised for invalid cases
-        with pytest.raises(ValueError):
-            scraper.clean_rate_value(rate_value)
-    else: # Check result is as expected for valid cases
-        assert scraper.clean_rate_value(rate_value) == expected_result
+    return pd.DataFrame({
+        "Tenure": np.repeat(np.asarray(tenures, dtype=float), len(lower_bounds)),
+        "Rate": np.asarray(rate_rows, dtype=float).ravel(),
+        "Deposit lower bound": np.tile(lower_bounds, len(tenures)),
+        "Deposit upper bound": np.tile(upper_bounds, len(tenures))
+    })
 
 @pytest.mark.parametrize(
     "raw_df, expected_df",
@@ -379,12 +388,12 @@ def test_clean_rate_value(rate_value, expected_result, raises_exception):
                 "$10,000 - $19,999": ["0.2000", "0.5000", "0.8000"],
                 "$20,000 - $49,999": ["0.3000", "0.6000", "0.9000"]
             }),
-            pd.DataFrame({
-                "Tenure": [1.0, 1.0, 1.0, 2.0, 2.0, 2.0, 3.0, 3.0, 3.0],
-                "Rate": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9],
-                "Deposit lower bound": [1000.0, 10000.0, 20000.0, 1000.0, 10000.0, 20000.0, 1000.0, 10000.0, 20000.0],
-                "Deposit upper bound": [9999.0, 19999.0, 49999.0, 9999.0, 19999.0, 49999.0, 9999.0, 19999.0, 49999.0]
-            })
+            _long_rates(
+                tenures=[1, 2, 3],
+                rate_rows=[[0.1, 0.2, 0.3], [0.4, 0.5, 0.6], [0.7, 0.8, 0.9]],
+                lower_bounds=[1000.0, 10000.0, 20000.0],
+                upper_bounds=[9999.0, 19999.0, 49999.0]
+            )
         ),
         (
             # Test Case 2: UOB website format
@@ -393,12 +402,12 @@ def test_clean_rate_value(rate_value, expected_result, raises_exception):
                 "Below S$50,000": ["0.10", "0.30", "0.50"],
                 "S$50,000 - S$249,999": ["0.20", "0.40", "0.60"]
             }),
-            pd.DataFrame({
-                "Tenure": [1.0, 1.0, 2.0, 2.0, 3.0, 3.0],
-                "Rate": [0.1, 0.2, 0.3, 0.4, 0.5, 0.6],
-                "Deposit lower bound": [0.0, 50000.0, 0.0, 50000.0, 0.0, 50000.0],
-                "Deposit upper bound": [49999.99, 249999.0, 49999.99, 249999.0, 49999.99, 249999.0]
-            })
+            _long_rates(
+                tenures=[1, 2, 3],
+                rate_rows=[[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]],
+                lower_bounds=[0.0, 50000.0],
+                upper_bounds=[49999.99, 249999.0]
+            )
         ),
         (
             # Test Case 3: OCBC website format
@@ -407,14 +416,15 @@ def test_clean_rate_value(rate_value, expected_result, raises_exception):
                 "S$5,000 - S$20,000": ["0.10", "0.30", "N.A"],
                 ">S$20,000 - S$50,000": ["0.20", "0.40", "N.A"]
             }),
-            pd.DataFrame({
-                "Tenure": [1.0, 1.0, 2.0, 2.0, 3.0, 3.0, 4.0, 4.0],
-                "Rate": [0.1, 0.2, 0.1, 0.2, 0.3, 0.4, 0.3, 0.4],
-                "Deposit lower bound": [5000.0, 20000.0, 5000.0, 20000.0, 5000.0, 20000.0, 5000.0, 20000.0],
-                "Deposit upper bound": [20000.01, 50000.0, 20000.01, 50000.0, 20000.01, 50000.0, 20000.01, 50000.0]
-            })
+            _long_rates(
+                tenures=[1, 2, 3, 4], # "48" row has only N.A rates, so it is dropped
+                rate_rows=[[0.1, 0.2], [0.1, 0.2], [0.3, 0.4], [0.3, 0.4]],
+                lower_bounds=[5000.0, 20000.0],
+                upper_bounds=[20000.01, 50000.0]
+            )
         )
-    ]
+    ],
+    ids=["dbs", "uob", "ocbc"]
 )
 def test_reshape_table(raw_df, expected_df):
     """
@@ -429,10 +439,18 @@ def test_reshape_table(raw_df, expected_df):
         expected_df (pd.DataFrame): The expected reshaped DataFrame.
     """
     reshaped_df = scraper.reshape_table(raw_df)
-    pd.testing.assert_frame_equal(
-        reshaped_df.reset_index(drop=True),
-        expected_df.reset_index(drop=True)
-    )
+    # Rows with N.A rates are dropped, so only the actual index needs resetting
+    pd.testing.assert_frame_equal(reshaped_df.reset_index(drop=True), expected_df)
+
+def test_reshape_table_without_data():
+    """
+    Tests that reshape_table raises a ValueError for tables with no tenure rows or no deposit range columns,
+    so that scrape_deposit_rates moves on to the next table.
+    """
+    with pytest.raises(ValueError):
+        scraper.reshape_table(pd.DataFrame(columns=["Period", "$1,000 - $9,999"]))
+    with pytest.raises(ValueError):
+        scraper.reshape_table(pd.DataFrame({"Period": ["1 mth", "2 mths"]}))
 
 def test_scrape_deposit_rates():
     """
@@ -440,11 +458,11 @@ def test_scrape_deposit_rates():
     
     This test verifies that the function correctly orchestrates the scraping pipeline
     and returns the expected reshaped DataFrame with additional columns. The test uses 
-    a predefined HTML structure to simulate a webpage and mock the fetch_webpage function. 
+    a predefined HTML structure to simulate a webpage, passed in through the fetcher argument instead of fetch_webpage. 
     extract_table and reshape_table are not mocked, allowing the test to validate their 
     integration.
     """
-    # Define a mock URL (not actually used since fetch_webpage is mocked)
+    # Define a mock URL (not actually used since the fetcher is replaced)
     mock_url = "http://example.com/deposit-rates"
     table_class = "rates-table"
 
@@ -478,23 +496,22 @@ def test_scrape_deposit_rates():
     """
 
     # Expected output DataFrame
-    expected_df = pd.DataFrame({
-        "Tenure": [1.0, 1.0, 2.0, 2.0],
-        "Rate": [0.1, 0.2, 0.3, 0.4],
-        "Deposit lower bound": [1000.0, 10000.0, 1000.0, 10000.0],
-        "Deposit upper bound": [9999.0, 19999.0, 9999.0, 19999.0],
-        "Required multiples": [None, None, None, None],
-        "Product provider": ["test provider", "test provider", "test provider", "test provider"],
-        "Product": ["Fixed Deposit", "Fixed Deposit", "Fixed Deposit", "Fixed Deposit"]
-    })
-
-    # Mock fetch_webpage to return the predefined HTML
-    with patch("sgfixedincome_pkg.scraper.fetch_webpage", return_value=BeautifulSoup(mock_html, "html.parser")):
-        # Call the scrape_deposit_rates function
-        actual_df = scraper.scrape_deposit_rates(mock_url, table_class, "test provider")
+    expected_data = np.array([
+        [1.0, 0.1, 1000.0, 9999.0, None, "test provider", "Fixed Deposit"],
+        [1.0, 0.2, 10000.0, 19999.0, None, "test provider", "Fixed Deposit"],
+        [2.0, 0.3, 1000.0, 9999.0, None, "test provider", "Fixed Deposit"],
+        [2.0, 0.4, 10000.0, 19999.0, None, "test provider", "Fixed Deposit"]
+    ], dtype=object)
+    expected_df = pd.DataFrame(expected_data, columns=[
+        "Tenure", "Rate", "Deposit lower bound", "Deposit upper bound",
+        "Required multiples", "Product provider", "Product"
+    ]).astype({"Tenure": float, "Rate": float, "Deposit lower bound": float, "Deposit upper bound": float})
 
-        # Validate the result
-        pd.testing.assert_frame_equal(
-            actual_df.reset_index(drop=True),
-            expected_df.reset_index(drop=True)
+    # Inject a fetcher returning the predefined HTML in place of fetch_webpage
+    soup = BeautifulSoup(mock_html, "html.parser")
+    actual_df = scraper.scrape_deposit_rates(
+        mock_url, table_class, "test provider", fetcher=lambda url, parse_only=None: soup
         )
+
+    # Validate the result
+    pd.testing.assert_frame_equal(actual_df.reset_index(drop=True), expected_df)